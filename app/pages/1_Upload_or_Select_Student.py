@@ -1,7 +1,10 @@
-import streamlit as st
+import os
+
 import pandas as pd
+import streamlit as st
 
-from src.student_data.validators import remove_blocked_columns
+from app.utils import load_school_benchmarks
+from src.student_data.upload import spill_upload
 
 st.set_page_config(page_title="Upload Student Data", layout="wide")
 st.title("Upload or Select Student (Prototype Data Only)")
@@ -26,22 +29,21 @@ st.divider()
 st.subheader("Context School (Benchmarks)")
 
 try:
-    schools = pd.read_csv("data/schools_context.csv")
-    if {"school_id", "school_name"}.issubset(set(schools.columns)):
-        options = schools["school_name"].tolist()
-        default_name = st.session_state.get("selected_school_name", options[0])
-        selected_name = st.selectbox(
-            "Choose a context school",
-            options,
-            index=options.index(default_name) if default_name in options else 0
-        )
-        selected_row = schools[schools["school_name"] == selected_name].iloc[0].to_dict()
-
-        st.session_state["selected_school_name"] = selected_name
-        st.session_state["school_context_row"] = selected_row
-        st.caption(f"Current context school: **{selected_name}**")
-    else:
-        st.warning("schools_context.csv must include school_id and school_name for context selection.")
+    schools = load_school_benchmarks()
+    options = schools.names()
+    default_name = st.session_state.get("selected_school_name", options[0])
+    selected_name = st.selectbox(
+        "Choose a context school",
+        options,
+        index=options.index(default_name) if default_name in options else 0
+    )
+    selected_row = schools.by_name(selected_name)
+
+    st.session_state["selected_school_name"] = selected_name
+    st.session_state["school_context_row"] = selected_row
+    st.caption(f"Current context school: **{selected_name}**")
+except ValueError:
+    st.warning("schools_context.csv must include school_id and school_name for context selection.")
 except FileNotFoundError:
     st.warning("Optional: add data/schools_context.csv to enable context school selection.")
 
@@ -50,28 +52,74 @@ st.divider()
 uploaded = st.file_uploader("Upload synthetic student CSV", type=["csv"])
 use_sample = st.checkbox("Use included sample file (data/student_sample.csv)")
 
-df_raw = None
+SAMPLE_PATH = "data/student_sample.csv"
+
+source_key = None
 if uploaded is not None:
-    df_raw = pd.read_csv(uploaded)
+    source_key = ("upload", getattr(uploaded, "file_id", None), uploaded.name, uploaded.size)
 elif use_sample:
-    try:
-        df_raw = pd.read_csv("data/student_sample.csv")
-    except FileNotFoundError:
-        st.error("Sample file not found: data/student_sample.csv")
+    if not os.path.exists(SAMPLE_PATH):
+        st.error(f"Sample file not found: {SAMPLE_PATH}")
         st.stop()
+    source_key = ("sample", SAMPLE_PATH, os.path.getmtime(SAMPLE_PATH))
 
-if df_raw is None:
+if source_key is None:
     st.info("Upload a CSV (or check the sample box) to begin.")
     st.stop()
 
-# Guardrails
-df_clean, guardrails = remove_blocked_columns(df_raw)
+# Parse once per file: chunks are cleaned and spilled to a temporary columnar
+# store, so the session keeps a handle (not the rows) across reruns.
+if st.session_state.get("upload_key") != source_key:
+    previous = st.session_state.pop("student_store", None)
+    if previous is not None:
+        previous.discard()
+    cached_results = ("score_indexes", "signal_matrix", "school_comparison")
+    for key in ("upload_key", "upload_preview", "guardrails") + cached_results:
+        st.session_state.pop(key, None)
+
+    progress = st.progress(0.0, text="Reading CSV…")
 
-if guardrails.blocked_columns or guardrails.pii_columns:
+    def show_progress(fraction, rows):
+        progress.progress(fraction if fraction is not None else 0.0, text=f"Read {rows:,} rows…")
+
+    try:
+        if uploaded is not None:
+            uploaded.seek(0)
+            handle, guardrails, preview = spill_upload(
+                uploaded, name=uploaded.name, total_bytes=uploaded.size, on_progress=show_progress
+            )
+        else:
+            with open(SAMPLE_PATH, "rb") as f:
+                handle, guardrails, preview = spill_upload(
+                    f, name=SAMPLE_PATH, total_bytes=os.path.getsize(SAMPLE_PATH), on_progress=show_progress
+                )
+    except ImportError as e:
+        progress.empty()
+        st.error(str(e))
+        st.stop()
+    except (ValueError, pd.errors.ParserError, UnicodeDecodeError) as e:
+        progress.empty()
+        st.error(f"Could not read this CSV: {e}")
+        st.stop()
+    progress.empty()
+
+    st.session_state["upload_key"] = source_key
+    st.session_state["guardrails"] = guardrails
+    st.session_state["upload_preview"] = preview
+    if handle is not None:
+        st.session_state["student_store"] = handle
+
+guardrails = st.session_state["guardrails"]
+preview = st.session_state["upload_preview"]
+
+if guardrails.blocked_columns or guardrails.pii_columns or guardrails.pii_value_columns:
     st.error("Protected or sensitive fields were detected and removed. This data will NOT be used.")
-    blocked_all = guardrails.blocked_columns + guardrails.pii_columns
+    blocked_all = guardrails.blocked_columns + guardrails.pii_columns + list(guardrails.pii_value_columns)
     st.write("**Blocked Fields Detected:**")
     st.code(", ".join(blocked_all))
+    if guardrails.pii_value_columns:
+        st.write("**Columns whose values looked like PII:**")
+        st.code("\n".join(f"{col}: {', '.join(kinds)}" for col, kinds in guardrails.pii_value_columns.items()))
 else:
     st.success("No protected attributes or PII detected ✅")
 
@@ -80,10 +128,14 @@ if guardrails.missing_required:
     st.code(", ".join(guardrails.missing_required))
     st.stop()
 
-st.session_state["student_df"] = df_clean
-st.session_state["guardrails"] = guardrails
+if "student_store" not in st.session_state:
+    st.warning("The CSV has no data rows.")
+    st.stop()
+
+handle = st.session_state["student_store"]
 
 st.subheader("Preview (cleaned data used by the system)")
-st.dataframe(df_clean.head(25), use_container_width=True)
+st.caption(f"First {len(preview)} of {handle.rows:,} rows.")
+st.dataframe(preview, use_container_width=True)
 
 st.success("Loaded successfully. Go to the **Student Report** page next.")
@@ -1,17 +1,19 @@
 import streamlit as st
-import pandas as pd
 import traceback
+from contextlib import nullcontext
 
-from src.scoring.risk_score import score_dataframe
+from app.utils import get_signal_cache
+from src.profiling import PipelineProfiler
+from src.student_data.upload import SpilledUpload
 
 st.set_page_config(page_title="Student Report", layout="wide")
 st.title("Student Report")
 
-if "student_df" not in st.session_state:
+if "student_store" not in st.session_state:
     st.warning("No student data loaded yet. Go to the Upload page first.")
     st.stop()
 
-df: pd.DataFrame = st.session_state["student_df"]
+store: SpilledUpload = st.session_state["student_store"]
 
 config = st.session_state.get("config", {"threshold": 75})
 threshold = int(config.get("threshold", 75))
@@ -33,23 +35,24 @@ ctx = config.get("school_context")
 ctx_name = ctx.get("school_name") if isinstance(ctx, dict) else None
 st.info(f"**Context School:** {ctx_name if ctx_name else 'None selected'}")
 
-student_ids = sorted(df["student_id"].unique().tolist())
-selected_student = st.selectbox("Select student_id", student_ids)
+selected_student = st.selectbox("Select student_id", store.student_ids())
 
-student_df = df[df["student_id"] == selected_student].copy()
+# An offset slice of the per-student index built at upload; no scan over the cohort.
+student_df = store.timeseries(selected_student)
 
 st.subheader("Student timeline (synthetic data)")
 st.dataframe(student_df, use_container_width=True)
 
-# Scoring
+# Scoring (memoized: weight/threshold changes reuse the cached signals)
+profiling = st.session_state.get("profiling_enabled", False)
 try:
-    scored = score_dataframe(student_df, config=config)
+    with PipelineProfiler(f"student_report:{selected_student}") if profiling else nullcontext():
+        latest = get_signal_cache().score(student_df, config=config)
 except Exception as e:
     st.error("Scoring failed:")
     st.code("".join(traceback.format_exception(type(e), e, e.__traceback__)))
     st.stop()
 
-latest = scored.sort_values("week_date").iloc[-1]
 score_val = float(latest["support_signal"])
 
 st.subheader("Support Signal")
@@ -70,7 +73,7 @@ with st.expander("Show benchmark context used (for transparency)"):
 st.divider()
 
 st.markdown("### Top contributing indicators (overall)")
-overall_cols = [c for c in scored.columns if c.startswith("contrib_overall_")]
+overall_cols = [c for c in latest.index if c.startswith("contrib_overall_")]
 overall = latest[overall_cols].sort_values(ascending=False).head(5)
 
 for col, val in overall.items():
@@ -1,5 +1,10 @@
+import json
+
 import streamlit as st
-import pandas as pd
+
+from app.utils import load_school_benchmarks
+from src.scoring.context_matrix import score_students_by_school
+from src.scoring.risk_score import REQUIRED_COLS
 
 st.set_page_config(page_title="Benchmarks Context", layout="wide")
 st.title("Benchmarks & Context School")
@@ -8,20 +13,18 @@ st.caption("School benchmarks are used only as contextual reference points (scho
 
 # Load benchmarks
 try:
-    schools = pd.read_csv("data/schools_context.csv")
+    registry = load_school_benchmarks()
 except FileNotFoundError:
     st.error("Missing file: data/schools_context.csv")
     st.stop()
-
-required = {"school_id", "school_name"}
-if not required.issubset(set(schools.columns)):
-    st.error("schools_context.csv must include columns: school_id, school_name")
-    st.write("Found columns:", list(schools.columns))
+except ValueError as e:
+    st.error(f"schools_context.csv must include columns: school_id, school_name ({e})")
     st.stop()
+schools = registry.frame
 
 st.subheader("Select context school")
 
-options = schools["school_name"].tolist()
+options = registry.names()
 default_name = st.session_state.get("selected_school_name", options[0])
 
 selected_name = st.selectbox(
@@ -30,7 +33,7 @@ selected_name = st.selectbox(
     index=options.index(default_name) if default_name in options else 0
 )
 
-selected_row = schools[schools["school_name"] == selected_name].iloc[0].to_dict()
+selected_row = registry.by_name(selected_name)
 
 st.session_state["selected_school_name"] = selected_name
 st.session_state["school_context_row"] = selected_row
@@ -43,3 +46,29 @@ st.json(selected_row)
 st.divider()
 st.subheader("All benchmark schools (synthetic)")
 st.dataframe(schools, use_container_width=True)
+
+st.divider()
+st.subheader("Compare context schools (what-if)")
+st.caption("Support Signal for the loaded students under every context school. Student data is unchanged; only the context differs.")
+
+if "student_store" not in st.session_state:
+    st.info("Load student data on the Upload page to compare context schools.")
+else:
+    # Rescore only when the data, config or schools change, not when another
+    # student is picked for the chart.
+    store = st.session_state["student_store"]
+    config = st.session_state.get("config")
+    compare_key = (store.path, json.dumps(config, sort_keys=True, default=str), registry.version)
+    cached = st.session_state.get("school_comparison")
+    if cached is None or cached[0] != compare_key:
+        by_school = score_students_by_school(store.load(REQUIRED_COLS), schools, config)
+        by_school.columns = [registry.get(sid)["school_name"] for sid in by_school.columns]
+        st.session_state["school_comparison"] = cached = (compare_key, by_school)
+    by_school = cached[1]
+    threshold = int(st.session_state.get("config", {}).get("threshold", 75))
+
+    compare_student = st.selectbox("Student", by_school.index.tolist())
+    st.bar_chart(by_school.loc[compare_student])
+
+    st.write("Students at or above the threshold, per context school:")
+    st.dataframe((by_school >= threshold).sum().rename("review_count"), use_container_width=True)
@@ -1,5 +1,10 @@
 import streamlit as st
 
+from app.utils import load_school_benchmarks
+from src.scoring.risk_score import REQUIRED_COLS
+from src.scoring.sweep import candidate_weights, recency_signal_matrix, sweep_weights
+from src.scoring.thresholds import build_score_indexes
+
 st.set_page_config(page_title="Settings", layout="wide")
 st.title("Settings")
 
@@ -44,6 +49,73 @@ if abs(weight_sum - 1.0) < 0.01:
 else:
     st.warning(f"Weights currently sum to **{weight_sum:.2f}**. Try adjusting them to total **1.00** for clarity.")
 
+st.divider()
+st.subheader("Threshold Preview (loaded cohort)")
+st.caption("How many students each threshold would send to human review. Moving the threshold does not rescore anyone.")
+
+registry, registry_error = None, None
+try:
+    registry = load_school_benchmarks()
+except FileNotFoundError:
+    registry_error = "Add data/schools_context.csv to preview review counts per context school."
+except ValueError as e:
+    registry_error = f"schools_context.csv must include columns: school_id, school_name ({e})"
+
+if "student_store" not in st.session_state:
+    st.info("Load student data on the Upload page to preview review counts.")
+elif registry_error:
+    st.warning(registry_error)
+elif len(registry) == 0:
+    st.info("schools_context.csv has no schools, so there is no context school to preview against.")
+else:
+    # One scoring run per (data, decay, weights); every threshold reads the sorted index.
+    store = st.session_state["student_store"]
+    index_key = (store.path, registry.version, cfg["decay_rate"], tuple(sorted(w.items())))
+    cached = st.session_state.get("score_indexes")
+    if cached is None or cached[0] != index_key:
+        indexes = build_score_indexes(store.load(REQUIRED_COLS), registry.frame, cfg)
+        st.session_state["score_indexes"] = cached = (index_key, indexes)
+    indexes = cached[1]
+
+    ctx = st.session_state.get("school_context_row", None)
+    school_id = ctx.get("school_id") if isinstance(ctx, dict) else None
+    if school_id not in indexes:
+        school_id = next(iter(indexes))
+    score_index = indexes[school_id]
+
+    n_review = score_index.review_count(cfg["threshold"])
+    st.metric(
+        f"Students at or above {cfg['threshold']} ({registry.get(school_id)['school_name']})",
+        f"{n_review} of {len(score_index)}",
+    )
+    st.line_chart(score_index.curve().set_index("threshold")["review_count"])
+
+st.divider()
+st.subheader("Weight Sweep (loaded cohort)")
+st.caption("How the Support Signal distribution and review count shift if each weight moves a little. No one is rescored.")
+
+if "student_store" not in st.session_state:
+    st.info("Load student data on the Upload page to preview weight changes across the cohort.")
+else:
+    sweep_ctx = st.session_state.get("school_context_row", None)
+    # The signal matrix depends only on (data, decay, context school); weight
+    # and threshold moves reuse it instead of reloading and rescoring.
+    matrix_key = (
+        st.session_state["student_store"].path,
+        cfg["decay_rate"],
+        sweep_ctx.get("school_id") if isinstance(sweep_ctx, dict) else None,
+    )
+    cached = st.session_state.get("signal_matrix")
+    if cached is None or cached[0] != matrix_key:
+        cohort = st.session_state["student_store"].load(REQUIRED_COLS)
+        matrix = recency_signal_matrix(cohort, {"decay_rate": cfg["decay_rate"], "school_context": sweep_ctx})
+        st.session_state["signal_matrix"] = cached = (matrix_key, matrix)
+    _, signals, multiplier = cached[1]
+    step = st.select_slider("Weight step", options=[0.01, 0.02, 0.05, 0.10], value=0.05)
+    sweep = sweep_weights(signals, candidate_weights(w, step), multiplier, cfg["threshold"])
+    sweep["review_change"] = sweep["review_count"] - int(sweep.loc["current", "review_count"])
+    st.dataframe(sweep.round(3), use_container_width=True)
+
 st.divider()
 st.write("Current config (this is what scoring will use):")
 st.json(st.session_state["config"])
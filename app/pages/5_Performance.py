@@ -0,0 +1,80 @@
+import streamlit as st
+import pandas as pd
+
+from app.utils import load_school_benchmarks
+from src.profiling import RECENT_RUNS, PipelineProfiler
+from src.scoring.risk_score import REQUIRED_COLS, score_students
+from src.explainability.explanations import generate_explanation_reports_bulk
+
+# Students read back from the spilled upload per profiled chunk.
+PROFILE_CHUNK_STUDENTS = 20_000
+
+st.set_page_config(page_title="Performance", layout="wide")
+st.title("Performance (Pipeline Stages)")
+st.caption("Opt-in timing of scoring and explanation stages. Nothing is recorded unless profiling is on.")
+
+st.session_state["profiling_enabled"] = st.toggle(
+    "Profile Student Report scoring",
+    value=st.session_state.get("profiling_enabled", False),
+)
+
+st.subheader("Profile the loaded cohort")
+if "student_store" not in st.session_state:
+    st.info("Load student data on the Upload page to profile a full run.")
+else:
+    # Guardrails already ran at upload; the cleaned store is read back in
+    # chunks of students, so a district-sized upload never sits in memory.
+    store = st.session_state["student_store"]
+    ids = store.student_ids()
+    n_students = st.number_input(
+        "Students to profile (first by student_id)",
+        min_value=1, max_value=len(ids), value=min(len(ids), PROFILE_CHUNK_STUDENTS), step=1000,
+    )
+    if st.button("Run scoring + explanations"):
+        ctx = st.session_state.get("school_context_row", None)
+        config = dict(st.session_state.get("config", {}))
+        config["school_context"] = ctx
+        schools = load_school_benchmarks() if isinstance(ctx, dict) and "school_id" in ctx else None
+
+        with PipelineProfiler(f"cohort:{n_students} students"):
+            for lo in range(0, n_students, PROFILE_CHUNK_STUDENTS):
+                chunk_ids = ids[lo:min(lo + PROFILE_CHUNK_STUDENTS, n_students)].tolist()
+                df = store.load(REQUIRED_COLS, student_ids=chunk_ids)
+                scores = score_students(df, config=config)
+                if schools is not None:
+                    for _ in generate_explanation_reports_bulk(df, schools, ctx["school_id"], scores):
+                        pass
+        st.success("Run recorded.")
+
+st.divider()
+st.subheader("Latest runs")
+
+if not RECENT_RUNS:
+    st.info("No profiled runs yet.")
+    st.stop()
+
+runs = list(RECENT_RUNS)[::-1]
+overview = pd.DataFrame([
+    {
+        "run": r.label,
+        "started": pd.Timestamp(r.started_at, unit="s"),
+        "total_seconds": r.total_seconds,
+        "stages": len(r.stages),
+    }
+    for r in runs
+])
+st.dataframe(overview, use_container_width=True)
+
+labels = [f"{i}: {r.label}" for i, r in enumerate(runs)]
+chosen = runs[labels.index(st.selectbox("Inspect run", labels))]
+
+stages = chosen.as_frame()
+by_stage = stages.groupby("stage", sort=False).agg(
+    calls=("seconds", "size"),
+    seconds=("seconds", "sum"),
+    rows=("rows", "max"),
+    bytes=("bytes", "sum"),
+)
+by_stage["share_of_run"] = by_stage["seconds"] / max(chosen.total_seconds, 1e-12)
+st.dataframe(by_stage.sort_values("seconds", ascending=False), use_container_width=True)
+st.bar_chart(by_stage["seconds"])
@@ -1,17 +1,27 @@
 import pandas as pd
 import streamlit as st
 
-@st.cache_data
-def load_school_benchmarks():
-    return pd.read_csv("data/benchmarks_processed.csv")
+from src.scoring.cache import SignalCache
+from src.scoring.school_context import SchoolContextRegistry, get_school_registry
+from src.student_data.loader import load_student_data
+from src.student_data.schema import parse_week_dates
+
+def load_school_benchmarks() -> SchoolContextRegistry:
+    # Process-wide registry; reloads by itself when the CSV changes.
+    return get_school_registry()
 
 @st.cache_data
 def load_sample_students():
-    return pd.read_csv("data/student_sample.csv")
+    return load_student_data("data/student_sample.csv")
+
+@st.cache_resource
+def get_signal_cache() -> SignalCache:
+    # One bounded cache per server process, shared by every session/rerun.
+    return SignalCache()
 
-def get_student_timeseries(df: pd.DataFrame, student_id: int) -> pd.DataFrame:
+def get_student_timeseries(df, student_id: int) -> pd.DataFrame:
     out = df[df["student_id"] == student_id].copy()
-    out["week_date"] = pd.to_datetime(out["week_date"])
+    out["week_date"] = parse_week_dates(out["week_date"], errors="raise")
     return out.sort_values("week_date")
 
 def ensure_session_defaults():
@@ -0,0 +1,119 @@
+"""
+Localhost load test for the scoring service.
+
+    python -m benchmarks.load_test                          # in-process server, 5 ms window
+    python -m benchmarks.load_test --window-ms 0            # no micro-batching, for comparison
+    python -m benchmarks.load_test --url 127.0.0.1:8765     # against a running run_service.py
+
+Each of --clients keep-alive connections sends --requests POST /score
+calls (one synthetic student each, --weeks rows) as fast as it can.
+Prints client-side throughput and latency plus the server's /metrics.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_students
+from src.service.server import ScoringService
+
+
+async def _call(reader, writer, method: str, path: str, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            t0 = time.perf_counter()
+            status, _ = await _call(reader, writer, "POST", "/score", body)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _bodies(n_clients: int, n_requests: int, n_weeks: int, school_id: int, seed: int):
+    students = make_students(n_clients * n_requests, n_weeks, seed=seed)
+    students["week_date"] = students["week_date"].astype(str)
+    groups = [g.to_dict("records") for _, g in students.groupby("student_id", sort=True)]
+    bodies = [{"rows": rows, "school_id": school_id} for rows in groups]
+    return [bodies[c::n_clients] for c in range(n_clients)]
+
+
+async def run(args) -> dict:
+    service = None
+    if args.url:
+        host, port = args.url.rsplit(":", 1)
+        port = int(port)
+    else:
+        service = ScoringService(window_ms=args.window_ms)
+        server = await service.start("127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    try:
+        per_client = _bodies(args.clients, args.requests, args.weeks, args.school_id, args.seed)
+
+        latencies, errors = [], []
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client(host, port, bodies, latencies, errors) for bodies in per_client))
+        wall = time.perf_counter() - t0
+
+        reader, writer = await asyncio.open_connection(host, port)
+        _, metrics = await _call(reader, writer, "GET", "/metrics")
+        writer.close()
+    finally:
+        if service is not None:
+            await service.stop()
+
+    lat_ms = np.array(latencies) * 1000.0
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(len(latencies) / wall, 1),
+        "p50_ms": round(float(np.percentile(lat_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat_ms, 99)), 2),
+        "server": metrics,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="host:port of a running service (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--weeks", type=int, default=20, help="weekly rows per request")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--school-id", type=int, default=1006)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
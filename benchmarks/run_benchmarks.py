@@ -0,0 +1,170 @@
+"""
+Benchmark suite for scoring, guardrails, features and explanations.
+
+    python -m benchmarks.run_benchmarks                     # all tiers, compare to baseline
+    python -m benchmarks.run_benchmarks --tiers 1k 100k     # subset
+    python -m benchmarks.run_benchmarks --write-baseline    # record a new baseline
+
+Each case records wall time (best of --repeat) and peak traced memory.
+Results more than --tolerance worse than the baseline are flagged and the
+exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import make_schools, make_students
+from src.explainability.explanations import (
+    generate_explanation_report,
+    generate_explanation_reports_bulk,
+)
+from src.features.benchmark_context import normalize_against_benchmark
+from src.features.student_features import build_student_features, build_student_features_bulk
+from src.scoring.parallel import score_students_parallel
+from src.scoring.risk_score import score_dataframe, score_student_summary, score_students
+from src.student_data.validators import remove_blocked_columns
+
+N_WEEKS = 20
+TIERS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}  # total weekly rows
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Per-student APIs are timed over a fixed sample so large tiers stay tractable.
+PER_STUDENT_SAMPLE = 200
+
+# Differences below these are treated as noise, whatever the ratio.
+MIN_DELTA = {"wall_s": 0.005, "peak_mb": 1.0}
+
+
+def _cases(students, schools):
+    school_id = int(schools["school_id"].iloc[0])
+    school_row = schools.iloc[0]
+    ctx = school_row.to_dict()
+    cfg = {"school_context": ctx}
+
+    sample_ids = students["student_id"].unique()[:PER_STUDENT_SAMPLE]
+    sample = {sid: g for sid, g in students[students["student_id"].isin(sample_ids)].groupby("student_id")}
+
+    raw = students.assign(gender="x", notes="ok", home_email="")
+    scores = score_students(students, cfg)
+    features = build_student_features_bulk(students)
+    benchmark_row = features.mean()  # cohort average, keyed like the features
+
+    def per_student_reports():
+        for sid, g in sample.items():
+            generate_explanation_report(g, schools, school_id, 50.0, False)
+
+    def normalize_all():
+        for row in features.to_dict("records"):
+            normalize_against_benchmark(row, benchmark_row)
+
+    return {
+        "score_dataframe[whole_frame]": lambda: score_dataframe(students, cfg),
+        "score_student_summary[whole_frame]": lambda: score_student_summary(students, cfg),
+        "score_students": lambda: score_students(students, cfg),
+        "score_students[records]": lambda: score_students(students, cfg, as_records=True),
+        "score_students_parallel": lambda: score_students_parallel(students, cfg),
+        "remove_blocked_columns": lambda: remove_blocked_columns(raw),
+        f"build_student_features[x{len(sample)}]": lambda: [build_student_features(g) for g in sample.values()],
+        "build_student_features_bulk": lambda: build_student_features_bulk(students),
+        "normalize_against_benchmark[all_students]": normalize_all,
+        f"generate_explanation_report[x{len(sample)}]": per_student_reports,
+        "generate_explanation_reports_bulk": lambda: list(
+            generate_explanation_reports_bulk(students, schools, school_id, scores)
+        ),
+    }
+
+
+def _measure(fn, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"wall_s": round(best, 6), "peak_mb": round(peak / 2**20, 3)}
+
+
+def run(tiers, repeat: int, seed: int) -> dict:
+    results = {}
+    for tier in tiers:
+        rows = TIERS[tier]
+        students = make_students(max(1, rows // N_WEEKS), N_WEEKS, seed=seed)
+        schools = make_schools(12, seed=seed)
+        for name, fn in _cases(students, schools).items():
+            key = f"{tier}/{name}"
+            results[key] = _measure(fn, repeat)
+            print(f"{key:60s} {results[key]['wall_s']:10.4f}s {results[key]['peak_mb']:10.1f} MB", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in ("wall_s", "peak_mb"):
+            worse = cur[metric] - base[metric]
+            if worse > MIN_DELTA[metric] and cur[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{key}: {metric} {base[metric]} -> {cur[metric]}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=list(TIERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional slowdown / memory growth before flagging")
+    args = parser.parse_args(argv)
+
+    results = run(args.tiers, args.repeat, args.seed)
+
+    if args.write_baseline:
+        existing = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                existing = json.load(f).get("results", {})
+        payload = {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "results": {**existing, **results},
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --write-baseline first.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for r in regressions:
+            print(f"  {r}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
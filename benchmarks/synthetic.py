@@ -0,0 +1,63 @@
+"""
+Deterministic synthetic district generator for benchmarks.
+
+All data is synthetic. Shapes follow data/student_sample.csv and
+data/schools_context.csv.
+"""
+import numpy as np
+import pandas as pd
+
+START_WEEK = "2025-09-01"
+
+
+def make_students(n_students: int, n_weeks: int, seed: int = 0) -> pd.DataFrame:
+    """
+    n_students x n_weeks weekly rows.
+
+    Each student has their own baseline; discipline events and truancy are
+    sparse (most students never have any, a minority have recurring ones).
+    """
+    rng = np.random.default_rng(seed)
+    n = n_students * n_weeks
+
+    grade_base = np.clip(rng.normal(80, 10, n_students), 30, 100)
+    tardy_rate = rng.gamma(0.8, 0.8, n_students)
+    absence_rate = rng.gamma(0.7, 0.9, n_students)
+    discipline_rate = np.where(rng.random(n_students) < 0.12, rng.gamma(1.0, 0.6, n_students), 0.0)
+    truancy_rate = np.where(rng.random(n_students) < 0.08, rng.gamma(1.0, 0.5, n_students), 0.0)
+
+    def per_row(x):
+        return np.repeat(x, n_weeks)
+
+    weeks = pd.date_range(START_WEEK, periods=n_weeks, freq="7D").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "student_id": per_row(np.arange(1, n_students + 1)),
+        "week_date": np.tile(weeks, n_students),
+        "grades": np.clip(per_row(grade_base) + rng.normal(0, 4, n), 0, 100).round(),
+        "tardies": rng.poisson(per_row(tardy_rate)),
+        "absences": rng.poisson(per_row(absence_rate)),
+        "discipline_events": rng.poisson(per_row(discipline_rate)),
+        "truancy_days": rng.poisson(per_row(truancy_rate)),
+    })
+
+
+def make_schools(n_schools: int, seed: int = 0) -> pd.DataFrame:
+    """n_schools rows with the schools_context.csv columns."""
+    rng = np.random.default_rng(seed)
+    need = rng.random(n_schools)  # 0 = well-resourced, 1 = high need
+
+    def pct(lo, hi, noise=5):
+        return np.clip(lo + (hi - lo) * need + rng.normal(0, noise, n_schools), 0, 100).round()
+
+    return pd.DataFrame({
+        "school_id": np.arange(1001, 1001 + n_schools),
+        "school_name": [f"Synthetic School {i}" for i in range(1, n_schools + 1)],
+        "math_achievement_pct": pct(95, 30),
+        "ela_achievement_pct": pct(92, 28),
+        "science_achievement_pct": pct(94, 30),
+        "graduation_rate_pct": pct(99, 58),
+        "chronic_absenteeism_pct": pct(3, 56),
+        "truancy_rate_pct": pct(2, 45),
+        "chronic_truancy_pct": pct(1, 23, noise=3),
+        "discipline_incidents_per_100": pct(2, 65),
+    })
@@ -0,0 +1,60 @@
+"""
+Printable check-in packets (HTML or PDF) for every student, against one
+context school.
+
+    python run_render_reports.py 1006 out/packets
+    python run_render_reports.py 1006 out/packets --students district_store/ --format pdf --workers 4
+
+Reruns skip students whose report has not changed; --force renders all.
+"""
+import argparse
+import sys
+
+from src.explainability.explanations import generate_explanation_reports_bulk
+from src.explainability.render import DEFAULT_BATCH_SIZE, RENDER_FORMATS, render_reports
+from src.scoring.parallel import score_students_parallel
+from src.scoring.school_context import SCHOOLS_PATH, get_school_registry
+from src.student_data.loader import load_student_data
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("school_id", type=int)
+    parser.add_argument("output_dir")
+    parser.add_argument("--students", default="data/student_sample.csv", help="weekly student CSV or store")
+    parser.add_argument("--schools", default=SCHOOLS_PATH)
+    parser.add_argument("--format", choices=RENDER_FORMATS, default="html")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--recent-window", type=int, default=None,
+                        help="compare the latest week with the prior k weeks (default: all prior weeks)")
+    parser.add_argument("--force", action="store_true", help="re-render unchanged reports too")
+    args = parser.parse_args(argv)
+
+    schools = get_school_registry(args.schools)
+    school = schools.get(args.school_id)
+    df = load_student_data(args.students)
+    scores = score_students_parallel(df, {"school_context": school}, workers=args.workers)
+
+    reports = generate_explanation_reports_bulk(
+        df, schools, args.school_id, scores, top_k=args.top_k, recent_window=args.recent_window
+    )
+
+    def progress(rendered: int, skipped: int) -> None:
+        print(f"\r{rendered + skipped}/{len(scores)} reports ({skipped} unchanged)", end="", flush=True)
+
+    try:
+        counts = render_reports(
+            reports, args.output_dir, fmt=args.format, workers=args.workers,
+            batch_size=args.batch_size, force=args.force, on_progress=progress,
+        )
+    except ImportError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"\nrendered {counts['rendered']}, unchanged {counts['skipped']} -> {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,52 @@
-import pandas as pd
-from src.scoring.risk_score import score_dataframe
+"""
+Explanation report for one student against a context school.
+
+    python run_report.py 4 1006
+    python run_report.py 4 1006 --students district_store/
+"""
+import argparse
+import json
+import sys
+
 from src.explainability.explanations import generate_explanation_report
+from src.scoring.risk_score import score_students
+from src.scoring.school_context import get_school_registry
+from src.student_data.loader import load_student_data
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("student_id", type=int)
+    parser.add_argument("school_id", type=int)
+    parser.add_argument("--students", default="data/student_sample.csv", help="weekly student CSV or store")
+    parser.add_argument("--schools", default="data/schools_context.csv")
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    schools = get_school_registry(args.schools)
 
-students = pd.read_csv("data/student_sample.csv")
-schools = pd.read_csv("data/benchmarks_processed.csv")
+    # Only this student's rows are loaded
+    student_ts = load_student_data(args.students, student_ids=[args.student_id])
+    if student_ts.empty:
+        raise ValueError(f"student_id {args.student_id} not found in {args.students}")
 
-# Demo selection
-student_id = 4
-school_id = 1006
+    # Step E scoring, in the context of the same school
+    config = {"school_context": schools.get(args.school_id)}
+    summary = score_students(student_ts, config).iloc[0]
 
-# IMPORTANT: copy() prevents SettingWithCopyWarning
-student_ts = students[students["student_id"] == student_id].copy()
+    # Step F explainability report
+    report = generate_explanation_report(
+        student_timeseries=student_ts,
+        school_benchmarks=schools,
+        school_id=args.school_id,
+        support_likelihood_score=float(summary["support_signal"]),
+        needs_supportive_check_in=summary["recommendation"] == "review",
+        top_k=args.top_k,
+    )
 
-# Step E scoring
-scored = score_dataframe(student_ts)
-score = float(scored.iloc[-1]["support_likelihood"])
-needs = bool(scored.iloc[-1]["needs_supportive_check_in"])
+    print(json.dumps(report, indent=2, default=str))
+    return 0
 
-# Step F explainability report
-report = generate_explanation_report(
-    student_timeseries=student_ts,
-    school_benchmarks=schools,
-    school_id=school_id,
-    support_likelihood_score=score,
-    needs_supportive_check_in=needs,
-    top_k=5
-)
 
-print(report)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,54 @@
-import pandas as pd
-from src.scoring.risk_score import score_dataframe
+"""
+Batch scoring: one summary row per student, streamed to part files.
 
-# Load synthetic student data
-df = pd.read_csv("data/student_sample.csv")
+    python run_scoring.py data/student_sample.csv out/scores
+    python run_scoring.py district_store/ out/scores --format parquet \
+        --config config.json --school 1006 --chunk-size 50000
 
-# Run Step E scoring
-scored_df = score_dataframe(df)
+Rerunning the same command after an interruption resumes from the
+checkpoint in the output directory.
+"""
+import argparse
+import json
+import sys
 
-# Print only columns that ACTUALLY exist now
-print(
-    scored_df[
-        ["student_id", "support_likelihood", "needs_supportive_check_in"]
-    ]
-)
+from src.scoring.batch import DEFAULT_CHUNK_SIZE, OUTPUT_FORMATS, load_school_context, run_batch
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="weekly student CSV or student store directory")
+    parser.add_argument("output_dir", help="directory for part files and the checkpoint")
+    parser.add_argument("--config", help="JSON file of scoring config overrides (weights, threshold, decay_rate)")
+    parser.add_argument("--school", help="context school: school_id or school_name")
+    parser.add_argument("--schools", default="data/schools_context.csv")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="csv")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="students per part file")
+    parser.add_argument("--workers", type=int, default=None, help="scoring processes (default: all cores)")
+    parser.add_argument("--detail", action="store_true",
+                        help="write full summary rows (recommendation text, context columns) instead of compact records")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    school_context = load_school_context(args.schools, args.school)
+    if school_context is not None:
+        config["school_context"] = school_context
+
+    def progress(chunk, n_chunks, n_students):
+        print(f"chunk {chunk + 1}/{n_chunks}: {n_students} students", flush=True)
+
+    checkpoint = run_batch(
+        args.input, args.output_dir, config,
+        fmt=args.format, chunk_size=args.chunk_size, workers=args.workers,
+        restart=args.restart, detail=args.detail, on_chunk=progress,
+    )
+    print(f"{checkpoint['n_students']} students scored into {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Local scoring service for on-demand Support Signals and reports.
+
+    python run_service.py                      # http://127.0.0.1:8765
+    python run_service.py --school 1006 --config config.json --window-ms 5
+
+Binds to localhost only by default. See src/service/server.py for the API.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from src.scoring.school_context import SCHOOLS_PATH
+from src.service.batcher import DEFAULT_WINDOW_MS
+from src.service.server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--config", help="JSON file of scoring config overrides (weights, threshold, decay_rate)")
+    parser.add_argument("--school", help="default context school: school_id or school_name")
+    parser.add_argument("--schools", default=SCHOOLS_PATH)
+    parser.add_argument("--window-ms", type=float, default=DEFAULT_WINDOW_MS,
+                        help="micro-batch window; 0 scores each request on its own")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+
+    print(f"Serving on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(serve(
+            args.host, args.port,
+            config=config, schools_path=args.schools, default_school=args.school, window_ms=args.window_ms,
+        ))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
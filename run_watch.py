@@ -0,0 +1,74 @@
+"""
+Watch a drop folder for weekly SIS exports and rescore only the students
+each new file touches.
+
+    python run_watch.py drop/ data/student_store out/scores
+    python run_watch.py drop/ data/student_store out/scores --school 1006 --poll 30
+    python run_watch.py drop/ data/student_store out/scores --once
+
+The first start scores the existing store once and snapshots the state in
+the output directory; later starts resume from that snapshot. See
+src/service/watcher.py for the directory layout.
+"""
+import argparse
+import json
+import sys
+
+from src.scoring.batch import OUTPUT_FORMATS, load_school_context
+from src.scoring.school_context import SCHOOLS_PATH
+from src.service.watcher import DEFAULT_POLL_SECONDS, IngestionDaemon
+
+
+def _print_cycle(cycle) -> None:
+    for r in cycle["files"]:
+        if r.error:
+            print(f"  rejected {r.path}: {r.error}", flush=True)
+            continue
+        removed = f", removed columns {r.removed_columns}" if r.removed_columns else ""
+        print(
+            f"  {r.path}: {r.rows_added} new rows for {r.students} students "
+            f"({r.duplicates} duplicates, {r.invalid_rows} invalid{removed})",
+            flush=True,
+        )
+    if cycle["scores_part"]:
+        print(f"rescored {cycle['rescored_students']} students -> {cycle['scores_part']}", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("drop_dir", help="directory new weekly CSV files are dropped into")
+    parser.add_argument("store", help="columnar student store (created if missing)")
+    parser.add_argument("output_dir", help="directory for score parts and the scorer snapshot")
+    parser.add_argument("--config", help="JSON file of scoring config overrides (weights, threshold, decay_rate)")
+    parser.add_argument("--school", help="context school: school_id or school_name")
+    parser.add_argument("--schools", default=SCHOOLS_PATH)
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="csv")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_SECONDS, help="seconds between polls")
+    parser.add_argument("--once", action="store_true",
+                        help="poll twice (files must hold still across one poll) and exit")
+    args = parser.parse_args(argv)
+
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    school_context = load_school_context(args.schools, args.school)
+    if school_context is not None:
+        config["school_context"] = school_context
+
+    try:
+        daemon = IngestionDaemon(args.drop_dir, args.store, args.output_dir, config, fmt=args.format)
+    except (ImportError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Watching {args.drop_dir} ({len(daemon.scorer.student_ids)} students scored)", flush=True)
+    try:
+        daemon.run(args.poll, on_cycle=_print_cycle, max_cycles=2 if args.once else None)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
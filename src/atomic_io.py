@@ -0,0 +1,39 @@
+"""
+Atomic output files shared by the batch scorer, the watch-folder daemon and
+the report renderer.
+
+Each writer fills `<path>.tmp` and then os.replace()s it over `path`, so a
+reader (or a rerun after a crash) sees either the old file or the complete
+new one, never a partial write.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict
+
+import pandas as pd
+
+OUTPUT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "jsonl": ".jsonl"}
+
+
+def write_json_atomic(obj: Dict[str, Any], path: str) -> None:
+    """Write `obj` as indented, key-sorted JSON."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def write_frame_atomic(df: pd.DataFrame, path: str, fmt: str) -> None:
+    """Write `df` without its index in one of OUTPUT_FORMATS."""
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(OUTPUT_FORMATS)}")
+    tmp = path + ".tmp"
+    if fmt == "csv":
+        df.to_csv(tmp, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_json(tmp, orient="records", lines=True, date_format="iso")
+    os.replace(tmp, path)
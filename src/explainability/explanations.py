@@ -1,5 +1,15 @@
+import json
+from typing import Iterable, Iterator
+
+import numpy as np
 import pandas as pd
 
+from src.profiling import stage
+from src.scoring.risk_score import _group_by_student
+from src.features.trends import recent_deltas
+from src.scoring.school_context import ACADEMIC_COLS, SchoolContextRegistry
+from src.student_data.schema import parse_week_dates
+
 LOW_IS_BETTER = {
     "absences": "chronic_absenteeism_pct",
     "truancy_days": "chronic_truancy_pct",
@@ -7,16 +17,30 @@ LOW_IS_BETTER = {
 }
 
 HIGH_IS_BETTER_SCHOOL = {
-    "grades": ["math_achievement_pct", "ela_achievement_pct", "science_achievement_pct"]
+    "grades": ACADEMIC_COLS
 }
 
-def _get_school_row(schools_df: pd.DataFrame, school_id: int) -> pd.Series:
-    school = schools_df[schools_df["school_id"] == school_id]
+DISCLAIMER = (
+    "Staff-in-the-loop decision support only. "
+    "This tool does not diagnose students, does not automate decisions, "
+    "and does not predict outcomes. Use for supportive check-ins only."
+)
+
+def _get_school_row(schools, school_id: int):
+    """
+    School row by id: a dictionary lookup for a SchoolContextRegistry, a scan
+    for a plain DataFrame.
+    """
+    if isinstance(schools, SchoolContextRegistry):
+        return schools.get(school_id)
+    school = schools[schools["school_id"] == school_id]
     if school.empty:
-        raise ValueError(f"school_id {school_id} not found in benchmarks_processed.csv")
+        raise ValueError(f"school_id {school_id} not found in schools_context.csv")
     return school.iloc[0]
 
 def _school_academic_avg(school_row: pd.Series) -> float:
+    if getattr(school_row, "academic_avg", None) is not None:
+        return school_row.academic_avg
     cols = HIGH_IS_BETTER_SCHOOL["grades"]
     return float(sum(school_row[c] for c in cols) / len(cols))
 
@@ -25,50 +49,20 @@ def _ratio(student_val: float, school_val: float) -> float:
         return 0.0
     return float(student_val / school_val)
 
-def _recent_change_summary(student_timeseries: pd.DataFrame) -> list[str]:
+def _recent_change_summary(student_timeseries: pd.DataFrame, window=None) -> list[str]:
     """
     Simple, interpretable 'what changed recently':
-    compares latest week to average of prior weeks.
+    compares latest week to average of prior weeks (the prior `window`
+    weeks, or all of them when None).
     """
-    df = student_timeseries.copy()
-    df["week_date"] = pd.to_datetime(df["week_date"])
-    df = df.sort_values("week_date")
-
-    if len(df) < 2:
+    week = parse_week_dates(student_timeseries["week_date"], errors="raise").to_numpy(dtype="datetime64[ns]")
+    order, _, starts, counts = _group_by_student(np.zeros(len(week), dtype=np.int64), week)
+    if not len(starts):
         return ["Not enough history to compute recent change."]
-
-    latest = df.iloc[-1]
-    prior = df.iloc[:-1]
-
-    changes = []
-
-    def delta_msg(col: str, label: str, higher_is_worse: bool):
-        prior_avg = prior[col].mean()
-        latest_val = latest[col]
-        diff = latest_val - prior_avg
-
-        # only report meaningful changes
-        if abs(diff) < 0.25:
-            return
-
-        direction = "increased" if diff > 0 else "decreased"
-        if higher_is_worse:
-            impact = "which may signal increased support need" if diff > 0 else "which may signal improvement"
-        else:
-            impact = "which may signal improvement" if diff > 0 else "which may signal increased support need"
-
-        changes.append(f"{label} {direction} recently (latest {latest_val:.1f} vs prior avg {prior_avg:.1f}), {impact}.")
-
-    # Higher is worse:
-    delta_msg("absences", "Absences", True)
-    delta_msg("tardies", "Tardies", True)
-    delta_msg("discipline_events", "Discipline events", True)
-    delta_msg("truancy_days", "Truancy days", True)
-
-    # Higher is better:
-    delta_msg("grades", "Grades", False)
-
-    return changes[:3] if changes else ["No major recent changes detected."]
+    values = np.column_stack([
+        student_timeseries[col].to_numpy(dtype=float)[order] for col, _, _ in RECENT_CHANGE_METRICS
+    ])
+    return _recent_changes_bulk(values, starts, counts, window)[0]
 
 def top_contributing_indicators(
     student_latest_row: pd.Series,
@@ -124,11 +118,12 @@ def top_contributing_indicators(
 
 def generate_explanation_report(
     student_timeseries: pd.DataFrame,
-    school_benchmarks: pd.DataFrame,
+    school_benchmarks,
     school_id: int,
     support_likelihood_score: float,
     needs_supportive_check_in: bool,
-    top_k: int = 5
+    top_k: int = 5,
+    recent_window=None,
 ) -> dict:
     """
     Full report for Step F:
@@ -138,18 +133,53 @@ def generate_explanation_report(
     - Benchmark context used (school-level only)
     - What changed recently
     - Disclaimers
+
+    school_benchmarks is a SchoolContextRegistry (id lookup) or the schools
+    DataFrame. recent_window compares the latest week with the prior k weeks
+    instead of all prior weeks.
     """
-    school_row = _get_school_row(school_benchmarks, school_id)
+    with stage("explain.school_lookup"):
+        school_row = _get_school_row(school_benchmarks, school_id)
 
     # Use latest student row for current indicators
-    df = student_timeseries.copy()
-    df["week_date"] = pd.to_datetime(df["week_date"])
-    latest_row = df.sort_values("week_date").iloc[-1]
+    with stage("explain.latest_row", rows=len(student_timeseries)):
+        df = student_timeseries.copy()
+        df["week_date"] = parse_week_dates(df["week_date"], errors="raise")
+        latest_row = df.sort_values("week_date").iloc[-1]
+
+    with stage("explain.indicators"):
+        indicators = top_contributing_indicators(latest_row, school_row, top_k=top_k)
+    with stage("explain.recent_changes", rows=len(df)):
+        recent_changes = _recent_change_summary(df, recent_window)
+
+    benchmark_context_used = _benchmark_context(school_row)
+
+    return {
+        "score": float(support_likelihood_score),
+        "supportive_check_in_recommended": bool(needs_supportive_check_in),
+        "top_contributing_indicators": indicators,
+        "what_changed_recently": recent_changes,
+        "benchmark_context_used": benchmark_context_used,
+        "disclaimer": DISCLAIMER
+    }
+
+
+# Display labels for "what changed recently", in reporting order.
+RECENT_CHANGE_METRICS = [
+    ("absences", "Absences", True),
+    ("tardies", "Tardies", True),
+    ("discipline_events", "Discipline events", True),
+    ("truancy_days", "Truancy days", True),
+    ("grades", "Grades", False),
+]
+# Smallest latest-vs-prior change worth reporting, and the slack allowed for
+# floating-point error in the running-sum means it is compared against.
+RECENT_CHANGE_MIN = 0.25
+CHANGE_TOLERANCE = 1e-9
 
-    indicators = top_contributing_indicators(latest_row, school_row, top_k=top_k)
-    recent_changes = _recent_change_summary(df)
 
-    benchmark_context_used = {
+def _benchmark_context(school_row: pd.Series) -> dict:
+    return {
         "school_id": int(school_row["school_id"]),
         "school_name": str(school_row["school_name"]),
         "benchmarks": {
@@ -162,15 +192,151 @@ def generate_explanation_report(
         }
     }
 
-    return {
-        "score": float(support_likelihood_score),
-        "supportive_check_in_recommended": bool(needs_supportive_check_in),
-        "top_contributing_indicators": indicators,
-        "what_changed_recently": recent_changes,
-        "benchmark_context_used": benchmark_context_used,
-        "disclaimer": (
-            "Staff-in-the-loop decision support only. "
-            "This tool does not diagnose students, does not automate decisions, "
-            "and does not predict outcomes. Use for supportive check-ins only."
-        )
-    }
+
+def _recent_changes_bulk(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, window=None) -> list[list[str]]:
+    """
+    _recent_change_summary for every student at once. `values` is rows x
+    RECENT_CHANGE_METRICS, grouped by student and sorted by week. Deltas
+    come from one cumulative-sum pass (trends.recent_deltas); messages are
+    formatted only for the (at most 3) changes each student shows.
+    """
+    latests, priors, diff = recent_deltas(values, starts, counts, window)
+    prior_label = "prior avg" if window is None else f"prior {int(window)}-week avg"
+
+    # Running-sum means can sit a few ulps off a direct mean; don't let that
+    # move a change that is exactly at the cut-off.
+    shown = np.abs(diff) >= RECENT_CHANGE_MIN - CHANGE_TOLERANCE
+    any_shown = shown.any(axis=1).tolist()
+    enough = (counts >= 2).tolist()
+    latests, priors = latests.tolist(), priors.tolist()
+    diff, shown = diff.tolist(), shown.tolist()
+
+    out = []
+    for i in range(len(starts)):
+        if not enough[i]:
+            out.append(["Not enough history to compute recent change."])
+            continue
+        if not any_shown[i]:
+            out.append(["No major recent changes detected."])
+            continue
+        changes = []
+        for j in [j for j, keep in enumerate(shown[i]) if keep][:3]:
+            _, label, higher_is_worse = RECENT_CHANGE_METRICS[j]
+            d = diff[i][j]
+            direction = "increased" if d > 0 else "decreased"
+            if higher_is_worse:
+                impact = "which may signal increased support need" if d > 0 else "which may signal improvement"
+            else:
+                impact = "which may signal improvement" if d > 0 else "which may signal increased support need"
+            changes.append(
+                f"{label} {direction} recently (latest {latests[i][j]:.1f} vs {prior_label} {priors[i][j]:.1f}), {impact}."
+            )
+        out.append(changes)
+    return out
+
+
+def generate_explanation_reports_bulk(
+    students_df: pd.DataFrame,
+    schools_df,
+    school_id: int,
+    scores: pd.DataFrame,
+    top_k: int = 5,
+    recent_window=None,
+) -> Iterator[dict]:
+    """
+    generate_explanation_report for every scored student in one pass.
+
+    `scores` is score_students output (student_id, support_signal,
+    recommendation). Latest-week ratios, concern ranking and recent-change
+    deltas are computed as students x indicators arrays; only the messages
+    for the indicators actually kept are formatted. Yields one report per
+    student (with a student_id key) in student_id order; students without
+    a score are skipped. schools_df may be a SchoolContextRegistry;
+    recent_window is as in generate_explanation_report.
+    """
+    school_row = _get_school_row(schools_df, school_id)
+    benchmark_context_used = _benchmark_context(school_row)
+
+    with stage("explain_bulk.sort", rows=len(students_df)):
+        week = parse_week_dates(students_df["week_date"], errors="raise").to_numpy(dtype="datetime64[ns]")
+        order, ids, starts, counts = _group_by_student(students_df["student_id"].to_numpy(), week)
+        last = order[starts + counts - 1]
+
+    with stage("explain_bulk.rank_and_changes", rows=len(ids)):
+        # students x indicators, in top_contributing_indicators' order
+        indicator_cols = list(LOW_IS_BETTER) + ["grades"]
+        student_vals = np.column_stack([students_df[c].to_numpy(dtype=float)[last] for c in indicator_cols])
+        school_acad = _school_academic_avg(school_row)
+        school_vals = np.array([float(school_row[c]) for c in LOW_IS_BETTER.values()] + [school_acad])
+        safe = np.where(school_vals != 0, school_vals, 1.0)
+        ratio = np.round(np.where(school_vals != 0, student_vals / safe, 0.0), 2)
+
+        concern = ratio.copy()
+        g = ratio[:, -1]
+        with np.errstate(divide="ignore"):
+            concern[:, -1] = np.where(g > 0, 1.0 / np.where(g > 0, g, 1.0), 999)
+        rank = np.argsort(-concern, axis=1, kind="stable")[:, :top_k]
+
+        values = np.column_stack([
+            students_df[col].to_numpy(dtype=float)[order] for col, _, _ in RECENT_CHANGE_METRICS
+        ])
+        recent = _recent_changes_bulk(values, starts, counts, recent_window)
+
+    aligned = scores.set_index("student_id").reindex(ids)
+    support = aligned["support_signal"].to_numpy(dtype=float).tolist()
+    review = (aligned["recommendation"] == "review").to_numpy().tolist()
+    student_vals_l, ratio_l = student_vals.tolist(), ratio.tolist()
+    school_vals_l = school_vals.tolist()
+    acad = round(school_acad, 2)
+
+    for i, sid in enumerate(ids.tolist()):
+        if support[i] != support[i]:  # NaN: student has no score
+            continue
+
+        indicators = []
+        for j in rank[i].tolist():
+            col = indicator_cols[j]
+            sv, r = student_vals_l[i][j], ratio_l[i][j]
+            if col == "grades":
+                indicators.append({
+                    "indicator": "grades",
+                    "direction": "lower_is_worse",
+                    "student_value": sv,
+                    "school_benchmark": acad,
+                    "relative_to_school": r,
+                    "message": f"grades are {r}× the school academic benchmark ({sv} vs {acad})."
+                })
+            else:
+                bv = school_vals_l[j]
+                indicators.append({
+                    "indicator": col,
+                    "direction": "higher_is_worse",
+                    "student_value": sv,
+                    "school_benchmark": bv,
+                    "relative_to_school": r,
+                    "message": f"{col} is {r}× the school benchmark ({sv} vs {bv})."
+                })
+
+        yield {
+            "student_id": sid,
+            "score": support[i],
+            "supportive_check_in_recommended": review[i],
+            "top_contributing_indicators": indicators,
+            "what_changed_recently": recent[i],
+            "benchmark_context_used": {
+                **benchmark_context_used,
+                "benchmarks": dict(benchmark_context_used["benchmarks"]),
+            },
+            "disclaimer": DISCLAIMER,
+        }
+
+
+def write_explanation_reports_jsonl(reports: Iterable[dict], path: str) -> int:
+    """Stream reports to a JSON Lines file; returns the number written."""
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for report in reports:
+            f.write(json.dumps(report, ensure_ascii=False))
+            f.write("\n")
+            n += 1
+    return n
@@ -0,0 +1,232 @@
+"""
+Printable per-student packets from explanation report dicts.
+
+The HTML template is compiled once per process (string.Template objects
+built at import), then filled for each student. render_reports() spreads
+the filling and writing across a process pool in fixed-size batches with a
+bounded number in flight, so memory stays flat however many students are
+streamed in from generate_explanation_reports_bulk.
+
+Each report's input hash (report content, format and the template text) is
+recorded in `_render_manifest.json`; a rerun skips students whose hash is
+unchanged and whose file is still there, so editing a template re-renders
+every packet. PDF output needs weasyprint (optional).
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from string import Template
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.atomic_io import write_json_atomic
+
+try:
+    import weasyprint
+except ImportError:  # optional: only needed for PDF output
+    weasyprint = None
+
+RENDER_FORMATS = ("html", "pdf")
+MANIFEST_FILE = "_render_manifest.json"
+DEFAULT_BATCH_SIZE = 200  # reports per pool task
+
+_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Student $student_id - check-in packet</title>
+<style>
+  body { font-family: Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+  h1 { font-size: 1.4em; margin-bottom: 0.2em; }
+  .meta { color: #555; margin-bottom: 1.5em; }
+  .score { font-size: 1.1em; }
+  table { border-collapse: collapse; width: 100%; margin: 0.5em 0 1.5em; }
+  th, td { border: 1px solid #ccc; padding: 0.35em 0.6em; text-align: left; font-size: 0.9em; }
+  th { background: #f3f3f3; }
+  .disclaimer { font-size: 0.8em; color: #555; border-top: 1px solid #ccc; padding-top: 0.8em; }
+  @page { size: letter; margin: 1.5cm; }
+</style>
+</head>
+<body>
+<h1>Student $student_id</h1>
+<div class="meta">Context school: $school_name ($school_id)</div>
+<p class="score">Support Signal: <strong>$score</strong> &mdash; $recommendation</p>
+<h2>Top contributing indicators</h2>
+<table>
+<tr><th>Indicator</th><th>Student</th><th>School benchmark</th><th>Relative to school</th><th>Note</th></tr>
+$indicator_rows
+</table>
+<h2>What changed recently</h2>
+<ul>
+$change_items
+</ul>
+<h2>School benchmarks used</h2>
+<table>
+$benchmark_rows
+</table>
+<p class="disclaimer">$disclaimer</p>
+</body>
+</html>
+""")
+_INDICATOR_ROW = Template(
+    "<tr><td>$indicator</td><td>$student_value</td><td>$school_benchmark</td>"
+    "<td>$relative_to_school&times;</td><td>$message</td></tr>"
+)
+_CHANGE_ITEM = Template("<li>$text</li>")
+_BENCHMARK_ROW = Template("<tr><th>$name</th><td>$value</td></tr>")
+# Digest of the template text, part of every report hash.
+TEMPLATE_DIGEST = hashlib.blake2b(
+    "\0".join(t.template for t in (_PAGE, _INDICATOR_ROW, _CHANGE_ITEM, _BENCHMARK_ROW)).encode(),
+    digest_size=8,
+).hexdigest()
+
+
+def _require_weasyprint() -> None:
+    if weasyprint is None:
+        raise ImportError("PDF reports need weasyprint (pip install weasyprint).")
+
+
+def _e(value: Any) -> str:
+    return html.escape(str(value))
+
+
+def render_report_html(report: Dict[str, Any]) -> str:
+    """One report dict (as from generate_explanation_report[s_bulk]) as an HTML page."""
+    context = report["benchmark_context_used"]
+    rows = "\n".join(
+        _INDICATOR_ROW.substitute({k: _e(item[k]) for k in
+                                   ("indicator", "student_value", "school_benchmark", "relative_to_school", "message")})
+        for item in report["top_contributing_indicators"]
+    )
+    changes = "\n".join(_CHANGE_ITEM.substitute(text=_e(t)) for t in report["what_changed_recently"])
+    benchmarks = "\n".join(
+        _BENCHMARK_ROW.substitute(name=_e(name.replace("_", " ")), value=_e(value))
+        for name, value in context["benchmarks"].items()
+    )
+    return _PAGE.substitute(
+        student_id=_e(report.get("student_id", "")),
+        school_name=_e(context["school_name"]),
+        school_id=_e(context["school_id"]),
+        score=f"{float(report['score']):.1f}",
+        recommendation="supportive check-in recommended" if report["supportive_check_in_recommended"]
+        else "no check-in flagged",
+        indicator_rows=rows,
+        change_items=changes,
+        benchmark_rows=benchmarks,
+        disclaimer=_e(report["disclaimer"]),
+    )
+
+
+def report_hash(report: Dict[str, Any], fmt: str) -> str:
+    """Input hash: the report's content plus the template text and format."""
+    blob = json.dumps([TEMPLATE_DIGEST, fmt, report], sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def _report_file(student_id: Any, fmt: str) -> str:
+    return f"student-{student_id}.{fmt}"
+
+
+def _render_batch(items: List[Tuple[Any, Dict[str, Any]]], output_dir: str, fmt: str) -> List[Any]:
+    """Worker: render and write one batch of (student_id, report); returns the ids written."""
+    for student_id, report in items:
+        page = render_report_html(report)
+        path = os.path.join(output_dir, _report_file(student_id, fmt))
+        tmp = path + ".tmp"
+        if fmt == "pdf":
+            weasyprint.HTML(string=page).write_pdf(tmp)
+        else:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(page)
+        os.replace(tmp, path)
+    return [student_id for student_id, _ in items]
+
+
+def render_reports(
+    reports: Iterable[Dict[str, Any]],
+    output_dir: str,
+    fmt: str = "html",
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    force: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Write one `student-<id>.<fmt>` packet per report into `output_dir`.
+
+    Reports need a student_id key (generate_explanation_reports_bulk adds
+    it). Unchanged reports are skipped unless force=True. At most
+    2 x workers batches are pending at once, so `reports` can be a lazy
+    generator over a whole district. on_progress(rendered, skipped) is
+    called after each finished batch. Returns the final counts.
+    """
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"Unknown report format {fmt!r}; expected one of {list(RENDER_FORMATS)}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if fmt == "pdf":
+        _require_weasyprint()
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    previous: Dict[str, str] = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f).get("reports", {})
+
+    hashes: Dict[str, str] = {}
+    counts = {"rendered": 0, "skipped": 0}
+
+    def batches():
+        batch, batch_hashes = [], {}
+        for report in reports:
+            sid = report["student_id"]
+            key = str(sid)
+            digest = report_hash(report, fmt)
+            if previous.get(key) == digest and os.path.exists(os.path.join(output_dir, _report_file(sid, fmt))):
+                hashes[key] = digest
+                counts["skipped"] += 1
+                continue
+            batch.append((sid, report))
+            batch_hashes[key] = digest
+            if len(batch) >= batch_size:
+                yield batch, batch_hashes
+                batch, batch_hashes = [], {}
+        if batch:
+            yield batch, batch_hashes
+
+    def finished(batch_hashes: Dict[str, str]) -> None:
+        hashes.update(batch_hashes)
+        counts["rendered"] += len(batch_hashes)
+        if on_progress is not None:
+            on_progress(counts["rendered"], counts["skipped"])
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers <= 1:
+            for batch, batch_hashes in batches():
+                _render_batch(batch, output_dir, fmt)
+                finished(batch_hashes)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {}
+                for batch, batch_hashes in batches():
+                    if len(pending) >= 2 * workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                            finished(pending.pop(future))
+                    pending[pool.submit(_render_batch, batch, output_dir, fmt)] = batch_hashes
+                for future in list(pending):
+                    future.result()
+                    finished(pending.pop(future))
+    finally:
+        # Record whatever finished, so an interrupted run resumes from here.
+        kept = {k: v for k, v in previous.items() if k not in hashes}
+        write_json_atomic({"template": TEMPLATE_DIGEST, "format": fmt, "reports": {**kept, **hashes}},
+                          manifest_path)
+
+    return dict(counts)
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from src.student_data.schema import parse_week_dates
+
 def apply_recency_decay(
     df: pd.DataFrame,
     date_col: str,
@@ -13,7 +15,7 @@ def apply_recency_decay(
     """
 
     df = df.copy()
-    df[date_col] = pd.to_datetime(df[date_col])
+    df[date_col] = parse_week_dates(df[date_col], errors="raise")
 
     # Most recent date
     most_recent = df[date_col].max()
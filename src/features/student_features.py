@@ -1,5 +1,16 @@
+import numpy as np
 import pandas as pd
 from src.features.recency import apply_recency_decay
+from src.student_data.schema import parse_week_dates
+
+# Output feature -> source column, in build_student_features' order.
+RECENT_FEATURES = {
+    "grades_recent": "grades",
+    "absences_recent": "absences",
+    "tardies_recent": "tardies",
+    "discipline_recent": "discipline_events",
+    "truancy_recent": "truancy_days",
+}
 
 def build_student_features(
     df: pd.DataFrame,
@@ -33,3 +44,32 @@ def build_student_features(
     )
 
     return features
+
+def build_student_features_bulk(
+    df: pd.DataFrame,
+    decay_rate: float = 0.1
+) -> pd.DataFrame:
+    """
+    build_student_features for every student at once.
+    Parses dates once, takes each student's most recent date from a grouped
+    max, evaluates exp(-decay_rate * days_ago) once, and reduces all five
+    columns with weighted bincounts.
+    Returns a students x features DataFrame indexed by student_id.
+    """
+    codes, ids = pd.factorize(df["student_id"], sort=True)
+    keep = codes >= 0
+    codes = codes[keep]
+
+    dates = parse_week_dates(df["week_date"], errors="raise").to_numpy(dtype="datetime64[ns]")[keep]
+    most_recent = pd.Series(dates).groupby(codes).max().to_numpy()
+    days_ago = (most_recent[codes] - dates) // np.timedelta64(1, "D")
+
+    weights = np.exp(-decay_rate * days_ago)
+    weight_sum = np.bincount(codes, weights=weights, minlength=len(ids))
+
+    features = {}
+    for name, col in RECENT_FEATURES.items():
+        values = df[col].to_numpy(dtype=float)[keep]
+        features[name] = np.bincount(codes, weights=weights * values, minlength=len(ids)) / weight_sum
+
+    return pd.DataFrame(features, index=pd.Index(ids, name="student_id"))
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from src.student_data.schema import parse_week_dates
+
+TREND_METRICS = ["grades", "tardies", "absences", "discipline_events", "truancy_days"]
+
+
+def _sort_by_student_week(df: pd.DataFrame):
+    """
+    Sort rows by (student_id, week_date), parsing dates once.
+    Returns (sorted frame, group number per row, group start per row, group starts).
+    """
+    out = df[df["student_id"].notna()].copy()
+    out["week_date"] = parse_week_dates(out["week_date"])
+    out = out.sort_values(["student_id", "week_date"], kind="stable", ignore_index=True)
+
+    ids = out["student_id"].to_numpy()
+    new_group = np.ones(len(ids), dtype=bool)
+    new_group[1:] = ids[1:] != ids[:-1]
+    starts = np.flatnonzero(new_group)
+    group = np.cumsum(new_group) - 1
+    return out, group, starts[group], starts
+
+
+def _padded_cumsum(values: np.ndarray) -> np.ndarray:
+    c = np.zeros(len(values) + 1)
+    np.cumsum(values, out=c[1:])
+    return c
+
+
+def add_rolling_features(df: pd.DataFrame, windows=(4,), metrics=TREND_METRICS) -> pd.DataFrame:
+    """
+    Row-level rolling features for every student at once (one row = one week):
+      - {metric}_sum_{k}w / {metric}_mean_{k}w over the student's last k rows
+        (fewer at the start of a history; missing values are skipped)
+      - {metric}_wow_delta: change from the student's previous week
+
+    Each window is a difference of one global cumulative sum, so the cost is
+    O(1) per row regardless of k. Returns a copy sorted by
+    (student_id, week_date).
+    """
+    out, _, row_start, _ = _sort_by_student_week(df)
+    return _rolling(out, row_start, windows, metrics)
+
+
+def _rolling(out: pd.DataFrame, row_start: np.ndarray, windows, metrics) -> pd.DataFrame:
+    i = np.arange(len(out))
+
+    new_cols = {}
+    for col in metrics:
+        x = out[col].to_numpy(dtype=float)
+        present = ~np.isnan(x)
+        c_sum = _padded_cumsum(np.where(present, x, 0.0))
+        c_cnt = _padded_cumsum(present.astype(float))
+
+        for k in windows:
+            lo = np.maximum(i - k + 1, row_start)
+            total = c_sum[i + 1] - c_sum[lo]
+            count = c_cnt[i + 1] - c_cnt[lo]
+            new_cols[f"{col}_sum_{k}w"] = total
+            with np.errstate(invalid="ignore", divide="ignore"):
+                new_cols[f"{col}_mean_{k}w"] = np.where(count > 0, total / count, np.nan)
+
+        prev = np.full(len(x), np.nan)
+        prev[1:] = x[:-1]
+        new_cols[f"{col}_wow_delta"] = np.where(i > row_start, x - prev, np.nan)
+
+    return pd.concat([out, pd.DataFrame(new_cols, index=out.index)], axis=1)
+
+
+def trend_slopes(df: pd.DataFrame, metrics=TREND_METRICS) -> pd.DataFrame:
+    """
+    Least-squares slope of each metric per week of elapsed time, per student,
+    from grouped sums (n, Σx, Σy, Σxy, Σx²) in closed form. x is weeks since
+    the student's first week. NaN where a student has fewer than two
+    distinct dated weeks. Returns a students x metrics frame ({metric}_slope).
+    """
+    return _slopes(*_sort_by_student_week(df), metrics)
+
+
+def _slopes(out: pd.DataFrame, group: np.ndarray, row_start: np.ndarray, starts: np.ndarray, metrics) -> pd.DataFrame:
+    n_groups = len(starts)
+
+    week = out["week_date"].to_numpy(dtype="datetime64[ns]")
+    first = week[row_start]
+    x_all = (week - first) / np.timedelta64(7, "D")
+
+    slopes = {}
+    for col in metrics:
+        y = out[col].to_numpy(dtype=float)
+        ok = ~np.isnan(y) & ~np.isnan(x_all)
+        x, yv = np.where(ok, x_all, 0.0), np.where(ok, y, 0.0)
+        w = ok.astype(float)
+
+        n = np.bincount(group, weights=w, minlength=n_groups)
+        sx = np.bincount(group, weights=x, minlength=n_groups)
+        sy = np.bincount(group, weights=yv, minlength=n_groups)
+        sxy = np.bincount(group, weights=x * yv, minlength=n_groups)
+        sxx = np.bincount(group, weights=x * x, minlength=n_groups)
+
+        denom = n * sxx - sx * sx
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slopes[f"{col}_slope"] = np.where(denom > 1e-12, (n * sxy - sx * sy) / denom, np.nan)
+
+    ids = out["student_id"].to_numpy()[starts]
+    return pd.DataFrame(slopes, index=pd.Index(ids, name="student_id"))
+
+
+def recent_deltas(values: np.ndarray, starts: np.ndarray, counts: np.ndarray, window=None):
+    """
+    Latest row vs the mean of the prior `window` rows (all prior rows when
+    None) for every student and metric at once. `values` is rows x metrics,
+    grouped by student (every row in one of the starts/counts runs) and
+    sorted by week; missing values are skipped.
+
+    One cumulative sum and count per metric column, as in _rolling, so any
+    window costs O(1) per student. The sums run over each value minus its
+    student's last present value, which keeps the running totals near zero so
+    their differences don't cancel on long histories; the change is read
+    off those sums directly. Returns (latest, prior_mean, change), each
+    students x metrics; prior_mean is NaN where there is no prior value.
+    """
+    last = starts + counts - 1
+    lo = starts if window is None else np.maximum(starts, last - int(window))
+    latest = values[last]
+
+    present = ~np.isnan(values)
+    # Each student's last present value per metric (0 when there is none).
+    seen = np.maximum.accumulate(np.where(present, np.arange(len(values))[:, None], -1), axis=0)
+    ref = seen[last] if len(last) else np.zeros((0, values.shape[1]), dtype=np.int64)
+    offset = np.where(ref >= starts[:, None], values[np.maximum(ref, 0), np.arange(values.shape[1])], 0.0)
+    rel = values - np.repeat(offset, counts, axis=0)
+    c_sum = np.zeros((len(values) + 1, values.shape[1]))
+    c_cnt = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(np.where(present, rel, 0.0), axis=0, out=c_sum[1:])
+    np.cumsum(present, axis=0, out=c_cnt[1:])
+
+    prior_n = c_cnt[last] - c_cnt[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prior_rel = np.where(prior_n > 0, (c_sum[last] - c_sum[lo]) / prior_n, np.nan)
+    change = np.where(np.isnan(latest), np.nan, -prior_rel)
+    return latest, offset + prior_rel, change
+
+
+def recent_changes(df: pd.DataFrame, window=None, metrics=TREND_METRICS) -> pd.DataFrame:
+    """
+    One row per student: each metric's latest week ({metric}_latest), the
+    mean of the prior `window` weeks ({metric}_prior_mean; all prior weeks
+    when None) and the difference ({metric}_change).
+    """
+    out, _, _, starts = _sort_by_student_week(df)
+    counts = np.diff(np.append(starts, len(out)))
+    latest, prior, change = recent_deltas(out[list(metrics)].to_numpy(dtype=float), starts, counts, window)
+
+    cols = {}
+    for j, col in enumerate(metrics):
+        cols[f"{col}_latest"] = latest[:, j]
+        cols[f"{col}_prior_mean"] = prior[:, j]
+        cols[f"{col}_change"] = change[:, j]
+    ids = out["student_id"].to_numpy()[starts]
+    return pd.DataFrame(cols, index=pd.Index(ids, name="student_id"))
+
+
+def student_trend_summary(df: pd.DataFrame, window: int = 4, metrics=TREND_METRICS) -> pd.DataFrame:
+    """
+    One row per student: the latest week's {window}-week rolling sum/mean
+    and week-over-week delta, plus the overall trend slope. This is the
+    "sustained for N weeks" context for staff.
+    """
+    out, group, row_start, starts = _sort_by_student_week(df)
+    rolling = _rolling(out, row_start, (window,), metrics)
+
+    last = np.append(starts[1:], len(out)) - 1
+    cols = [c for c in rolling.columns if c.endswith((f"_{window}w", "_wow_delta"))]
+    latest = rolling.iloc[last].set_index("student_id")[cols]
+    return latest.join(_slopes(out, group, row_start, starts, metrics))
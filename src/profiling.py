@@ -0,0 +1,111 @@
+"""
+Opt-in stage timing for the scoring, guardrail and explanation pipelines.
+
+    with PipelineProfiler("district run") as prof:
+        score_students(df, config)
+    prof.as_frame()
+
+Library code marks its stages with `with stage("sort", rows=n) as s:`. When
+no profiler is active in the current context, stage() returns a shared no-op
+object, so the instrumentation costs one ContextVar lookup per stage. Byte
+counts that take work to compute are passed to add_bytes as callables, so
+they are skipped too.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+import pandas as pd
+
+MAX_RECENT_RUNS = 50
+
+# Finished runs, newest last; read by the Performance page.
+RECENT_RUNS: Deque["PipelineProfiler"] = deque(maxlen=MAX_RECENT_RUNS)
+
+_active: ContextVar[Optional["PipelineProfiler"]] = ContextVar("active_profiler", default=None)
+
+
+@dataclass
+class StageRecord:
+    name: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    nbytes: int = 0
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, nbytes) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler: "PipelineProfiler", name: str, rows: Optional[int]):
+        self.record = StageRecord(name=name, rows=rows)
+        self._profiler = profiler
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.record.seconds = time.perf_counter() - self._t0
+        self._profiler.stages.append(self.record)
+        return False
+
+    def add_bytes(self, nbytes) -> None:
+        """
+        Count memory allocated by this stage (e.g. an output array's nbytes).
+        Pass a zero-argument callable when the figure itself costs something
+        to compute; it is only called while profiling.
+        """
+        self.record.nbytes += int(nbytes() if callable(nbytes) else nbytes)
+
+
+@dataclass
+class PipelineProfiler:
+    """Collects StageRecords for everything run inside its `with` block."""
+
+    label: str
+    stages: List[StageRecord] = field(default_factory=list)
+    started_at: float = 0.0
+    total_seconds: float = 0.0
+
+    def __enter__(self) -> "PipelineProfiler":
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.total_seconds = time.perf_counter() - self._t0
+        _active.reset(self._token)
+        RECENT_RUNS.append(self)
+        return False
+
+    def as_frame(self) -> pd.DataFrame:
+        """One row per stage, in the order stages finished."""
+        return pd.DataFrame(
+            [(s.name, s.seconds, s.rows, s.nbytes) for s in self.stages],
+            columns=["stage", "seconds", "rows", "bytes"],
+        )
+
+
+def stage(name: str, rows: Optional[int] = None):
+    """Time a pipeline stage if a PipelineProfiler is active; otherwise a no-op."""
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name, rows)
@@ -0,0 +1,220 @@
+"""
+Resumable batch scoring: input file/store -> per-student summaries on disk.
+
+Students are split into fixed chunks (by sorted student_id, `chunk_size`
+students each). Each finished chunk is written atomically as its own part
+file in the output directory, then recorded in `_checkpoint.json`. A rerun
+with the same input, config and chunk size skips every recorded chunk, so
+an interrupted nightly run picks up where it stopped.
+
+Part files hold compact per-student records (float32 scores, a boolean
+review flag); the per-run context values are written once, to the
+checkpoint. detail=True writes the full score_students frame instead.
+
+The input is never loaded whole. A first pass reads only student_id to fix
+the chunks. A store is then read one chunk's students at a time (pushdown);
+a CSV is streamed once into per-chunk spill files under `_spill/`, so a
+student's rows stay together however the file is ordered.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.atomic_io import OUTPUT_FORMATS, write_frame_atomic, write_json_atomic
+from src.profiling import stage
+from src.scoring.parallel import score_students_parallel
+from src.scoring.risk_score import REQUIRED_COLS, summary_context
+from src.scoring.school_context import get_school_registry
+from src.student_data.loader import load_student_data
+from src.student_data.store import _require_pyarrow, is_student_store, read_student_store
+
+CHECKPOINT_FILE = "_checkpoint.json"
+DEFAULT_CHUNK_SIZE = 50_000  # students per part file
+CSV_READ_ROWS = 500_000  # rows per read when streaming a CSV input
+SPILL_DIR = "_spill"
+
+
+def _input_fingerprint(path: str) -> Dict[str, Any]:
+    """Size and mtime of the input (every file, for a store directory)."""
+    files = [path]
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(d, f) for d, _, names in os.walk(path) for f in names
+        )
+    stats = [os.stat(f) for f in files]
+    return {
+        "path": os.path.abspath(path),
+        "files": len(files),
+        "bytes": int(sum(s.st_size for s in stats)),
+        "mtime_ns": int(max((s.st_mtime_ns for s in stats), default=0)),
+    }
+
+
+def _config_digest(config: Dict[str, Any]) -> str:
+    blob = json.dumps(config, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+def load_school_context(schools_path: str, school: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Context school matched by school_id or school_name (a SchoolContext dict)."""
+    if school is None:
+        return None
+    return get_school_registry(schools_path).lookup(school)
+
+
+def _student_ids(path: str) -> np.ndarray:
+    """Sorted distinct student_ids, reading only the id column."""
+    if is_student_store(path):
+        col = read_student_store(path, columns=["student_id"])["student_id"]
+        return np.unique(col.dropna().to_numpy())
+    parts = [
+        np.unique(chunk["student_id"].dropna().to_numpy())
+        for chunk in pd.read_csv(path, usecols=["student_id"], chunksize=CSV_READ_ROWS)
+    ]
+    return np.unique(np.concatenate(parts)) if parts else np.array([], dtype=np.int64)
+
+
+def _spill_path(spill_dir: str, chunk: int) -> str:
+    return os.path.join(spill_dir, f"chunk-{chunk:05d}.csv")
+
+
+def _spill_csv(path: str, edges: np.ndarray, chunks: set, spill_dir: str) -> None:
+    """
+    One pass over a CSV, appending each row to its student chunk's spill
+    file, so a chunk's students are complete however the file is ordered.
+    Rows of already-finished chunks (and rows without a student_id) are
+    skipped.
+    """
+    os.makedirs(spill_dir, exist_ok=True)
+    for rows in pd.read_csv(path, usecols=REQUIRED_COLS, chunksize=CSV_READ_ROWS):
+        rows = rows[rows["student_id"].notna()]
+        ids = rows["student_id"]
+        if ids.dtype.kind == "f" and (ids == ids.round()).all():
+            # A read chunk with a blank id comes back float; spill whole ids as ints.
+            rows = rows.assign(student_id=ids.astype(np.int64))
+        chunk_of = np.searchsorted(edges, rows["student_id"].to_numpy(), side="right") - 1
+        order = np.argsort(chunk_of, kind="stable")
+        sorted_chunks = chunk_of[order]
+        bounds = np.flatnonzero(np.diff(sorted_chunks)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(order)]):
+            chunk = int(sorted_chunks[lo]) if hi > lo else None
+            if chunk is None or chunk not in chunks:
+                continue
+            target = _spill_path(spill_dir, chunk)
+            rows.iloc[order[lo:hi]].to_csv(target, mode="a", header=not os.path.exists(target), index=False)
+
+
+def run_batch(
+    input_path: str,
+    output_dir: str,
+    config: Optional[Dict[str, Any]] = None,
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    restart: bool = False,
+    detail: bool = False,
+    on_chunk: Optional[Callable[[int, int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Score every student in `input_path` (CSV or student store) into part
+    files under `output_dir`, resuming from `_checkpoint.json` if present.
+
+    Raises ValueError if an existing checkpoint was made for a different
+    input, config, format, chunk size or detail setting (pass restart=True
+    to discard it).
+    on_chunk(chunk, n_chunks, n_students) is called after each chunk is
+    written. Returns the final checkpoint.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(OUTPUT_FORMATS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if fmt == "parquet":
+        _require_pyarrow()
+
+    config = dict(config or {})
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_path = os.path.join(output_dir, CHECKPOINT_FILE)
+
+    job = {
+        "input": _input_fingerprint(input_path),
+        "config": _config_digest(config),
+        "format": fmt,
+        "chunk_size": int(chunk_size),
+        "detail": bool(detail),
+    }
+    done = []
+    if os.path.exists(checkpoint_path) and not restart:
+        with open(checkpoint_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if {k: previous.get(k) for k in job} != job:
+            raise ValueError(
+                f"{checkpoint_path} belongs to a different job (input, config, format, "
+                "chunk size or detail changed); rerun with restart to start over"
+            )
+        done = previous.get("done", [])
+    else:
+        for name in os.listdir(output_dir):
+            if name.startswith("part-"):
+                os.remove(os.path.join(output_dir, name))
+
+    with stage("batch.student_ids"):
+        ids = _student_ids(input_path)
+    n_chunks = -(-len(ids) // chunk_size)
+    edges = ids[::chunk_size]
+
+    checkpoint = {
+        **job,
+        "context": summary_context(config),
+        "n_chunks": int(n_chunks),
+        "n_students": int(len(ids)),
+        "done": sorted(done),
+    }
+    write_json_atomic(checkpoint, checkpoint_path)
+
+    finished = set(done)
+    pending = [c for c in range(n_chunks) if c not in finished]
+    spill_dir = os.path.join(output_dir, SPILL_DIR)
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    if pending and not is_student_store(input_path):
+        with stage("batch.spill"):
+            _spill_csv(input_path, edges, set(pending), spill_dir)
+
+    workers = workers or os.cpu_count() or 1
+    # One pool for the whole run; each chunk's shards are submitted to it.
+    with (ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext()) as pool:
+        for chunk in pending:
+            with stage("batch.load"):
+                if is_student_store(input_path):
+                    chunk_ids = ids[chunk * chunk_size:(chunk + 1) * chunk_size]
+                    df = load_student_data(input_path, columns=REQUIRED_COLS, student_ids=chunk_ids.tolist())
+                else:
+                    spill = _spill_path(spill_dir, chunk)
+                    df = load_student_data(spill, columns=REQUIRED_COLS)
+            summary = score_students_parallel(df, config, workers=workers, as_records=not detail, pool=pool)
+            if not detail:
+                summary = pd.DataFrame(summary)
+
+            part = os.path.join(output_dir, f"part-{chunk:05d}{OUTPUT_FORMATS[fmt]}")
+            with stage("batch.write", rows=len(summary)):
+                write_frame_atomic(summary, part, fmt)
+
+            finished.add(chunk)
+            checkpoint["done"] = sorted(finished)
+            write_json_atomic(checkpoint, checkpoint_path)
+            if not is_student_store(input_path):
+                os.remove(spill)
+            if on_chunk is not None:
+                on_chunk(chunk, n_chunks, len(summary))
+
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    return checkpoint
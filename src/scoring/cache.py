@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.profiling import stage
+from src.scoring.risk_score import (
+    REQUIRED_COLS,
+    SIGNAL_COLS,
+    _anchors_from_school_context,
+    _context_multiplier,
+    _merge_config,
+    _recency_weights,
+    _require_columns,
+    _signal,
+    _summary_frame,
+)
+from src.student_data.schema import week_dates_ns
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def content_hash(student_df: pd.DataFrame) -> str:
+    """Stable hash of the scoring-relevant columns of one student's rows."""
+    hashed = pd.util.hash_pandas_object(student_df[REQUIRED_COLS], index=False)
+    return hashlib.blake2b(hashed.to_numpy().tobytes(), digest_size=16).hexdigest()
+
+
+class _LRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SignalCache:
+    """
+    Layered memo for scoring one student's timeline (score_dataframe's view
+    of the input: the whole frame is one student).
+
+      1. normalized signals (rows x 5), keyed by (content hash, anchors)
+      2. recency-weighted signals (5,), keyed by layer 1's key + decay_rate
+      3. weights / threshold / multiplier applied on every call (a 5-term
+         dot product), so moving those sliders never recomputes 1 or 2
+
+    Each layer is an LRU bounded to `max_entries` students.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._signals = _LRU(max_entries)
+        self._aggregates = _LRU(max_entries)
+        self._lock = threading.Lock()
+        self.hits = {"signals": 0, "aggregates": 0}
+        self.misses = {"signals": 0, "aggregates": 0}
+
+    def _normalized(self, key: Tuple, student_df: pd.DataFrame, anchors: Dict[str, float]):
+        cached = self._signals.get(key)
+        if cached is not None:
+            self.hits["signals"] += 1
+            return cached
+        self.misses["signals"] += 1
+
+        with stage("cache.normalize", rows=len(student_df)) as s:
+            week = week_dates_ns(student_df["week_date"])
+            order = np.lexsort((week.view("i8"), np.isnat(week)))
+            sig = np.column_stack([
+                _signal(col, student_df[col].to_numpy(dtype=float)[order], anchors) for col in SIGNAL_COLS
+            ])
+            valid = week[~np.isnat(week)]
+            latest = valid.max() if len(valid) else np.datetime64("NaT", "ns")
+            s.add_bytes(sig.nbytes)
+
+        value = (sig, latest)
+        self._signals.put(key, value)
+        return value
+
+    def _aggregate(self, key: Tuple, decay_rate: float, sig: np.ndarray) -> np.ndarray:
+        agg_key = key + (decay_rate,)
+        cached = self._aggregates.get(agg_key)
+        if cached is not None:
+            self.hits["aggregates"] += 1
+            return cached
+        self.misses["aggregates"] += 1
+
+        with stage("cache.aggregate", rows=len(sig)):
+            value = _recency_weights(len(sig), decay_rate) @ sig if len(sig) else np.zeros(len(SIGNAL_COLS))
+        self._aggregates.put(agg_key, value)
+        return value
+
+    def score(self, student_df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> pd.Series:
+        """
+        Same values as the per-student columns score_dataframe attaches
+        (support_signal, recommendation, contrib_overall_*, context_*),
+        returned as one Series.
+        """
+        cfg = _merge_config(config)
+        _require_columns(student_df)
+        ctx = cfg.get("school_context")
+        anchors = _anchors_from_school_context(ctx)
+        multiplier = _context_multiplier(ctx)
+
+        key = (content_hash(student_df), tuple(sorted(anchors.items())))
+        with self._lock:
+            sig, latest = self._normalized(key, student_df, anchors)
+            agg = self._aggregate(key, cfg["decay_rate"], sig)
+
+        summary = _summary_frame(
+            np.array([None]), np.array([len(sig)]), np.array([latest], dtype="datetime64[ns]"),
+            agg[None, :], cfg, ctx, anchors, multiplier,
+        )
+        return summary.iloc[0].drop("student_id")
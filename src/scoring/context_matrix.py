@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.risk_score import (
+    ANCHOR_KEYS,
+    SIGNAL_COLS,
+    _group_by_student,
+    _merge_config,
+    _normalize_grades,
+    _require_columns,
+    _segment_recency_weights,
+)
+from src.student_data.schema import week_dates_ns
+
+# Upper bound on rows x schools cells materialized at once.
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+
+def _ctx_col(schools_df: pd.DataFrame, col: str) -> np.ndarray:
+    # Mirrors `float(ctx.get(col, 0) or 0)` for every school at once.
+    if col not in schools_df.columns:
+        return np.zeros(len(schools_df))
+    return schools_df[col].to_numpy(dtype=float)
+
+
+def school_context_arrays(schools_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    _anchors_from_school_context and _context_multiplier for every row of a
+    schools table, as arrays aligned with its rows.
+    """
+    abs_pct = _ctx_col(schools_df, "chronic_absenteeism_pct")
+    tru_pct = _ctx_col(schools_df, "truancy_rate_pct")
+    disc = _ctx_col(schools_df, "discipline_incidents_per_100")
+    grad = _ctx_col(schools_df, "graduation_rate_pct")
+
+    climate = (
+        np.clip(abs_pct / 50.0, 0.0, 1.0) * 0.35
+        + np.clip(tru_pct / 50.0, 0.0, 1.0) * 0.35
+        + np.clip(disc / 80.0, 0.0, 1.0) * 0.20
+        + np.clip((100.0 - grad) / 50.0, 0.0, 1.0) * 0.10
+    )
+
+    return {
+        "tardies_bad": np.full(len(schools_df), 5.0),
+        "absences_bad": np.clip(2.5 + (abs_pct / 15.0), 2.0, 10.0),
+        "truancy_bad": np.clip(2.0 + (tru_pct / 15.0), 2.0, 10.0),
+        "discipline_bad": np.clip(2.0 + (disc / 20.0), 2.0, 10.0),
+        "multiplier": np.clip(0.85 + (climate * 0.30), 0.85, 1.15),
+    }
+
+
+def score_students_by_school(
+    df: pd.DataFrame,
+    schools_df: pd.DataFrame,
+    config: Optional[Dict[str, Any]] = None,
+    chunk_cells: int = DEFAULT_CHUNK_CELLS,
+) -> pd.DataFrame:
+    """
+    What-if scoring: every student's support_signal under every context
+    school, as a students x schools DataFrame (index student_id, columns
+    school_id). config's school_context is ignored.
+
+    Rows are sorted and recency-weighted once; normalization is broadcast
+    over a (rows x schools) block per metric, processed in whole-student
+    chunks of at most ~chunk_cells cells to bound memory.
+    """
+    cfg = _merge_config(config)
+    _require_columns(df)
+
+    ctx = school_context_arrays(schools_df)
+    n_schools = len(schools_df)
+
+    week = week_dates_ns(df["week_date"])
+    order, ids, starts, counts = _group_by_student(df["student_id"].to_numpy(), week)
+    w_rec = _segment_recency_weights(starts, counts, cfg["decay_rate"])
+    values = {col: df[col].to_numpy(dtype=float)[order] for col in SIGNAL_COLS}
+
+    weights = np.array([float(cfg["weights"].get(col, 0.0)) for col in SIGNAL_COLS])
+    total_weight = float(weights.sum())
+
+    # students x schools weighted-signal sum; grades don't depend on school
+    overall = np.zeros((len(starts), n_schools))
+    if len(starts):
+        grades = np.add.reduceat(_normalize_grades(values["grades"]) * w_rec, starts)
+        overall += (grades * weights[0])[:, None]
+
+    rows_per_chunk = max(1, chunk_cells // max(n_schools, 1))
+    s_lo = 0
+    while s_lo < len(starts):
+        # whole students, about rows_per_chunk rows
+        row_lo = starts[s_lo]
+        s_hi = max(s_lo + 1, int(np.searchsorted(starts, row_lo + rows_per_chunk)))
+        row_hi = starts[s_hi] if s_hi < len(starts) else len(w_rec)
+        local_starts = starts[s_lo:s_hi] - row_lo
+        w = w_rec[row_lo:row_hi, None]
+
+        for j, col in enumerate(SIGNAL_COLS):
+            if col == "grades" or weights[j] == 0:
+                continue
+            x = values[col][row_lo:row_hi, None]
+            sig = np.clip(x / ctx[ANCHOR_KEYS[col]][None, :], 0.0, 1.0)
+            sig = np.where(np.isnan(x), 0.0, sig)
+            overall[s_lo:s_hi] += np.add.reduceat(sig * w, local_starts, axis=0) * weights[j]
+
+        s_lo = s_hi
+
+    if total_weight <= 0:
+        base = np.zeros_like(overall)
+    else:
+        base = np.clip((overall / total_weight) * 100.0, 0.0, 100.0)
+    support = np.clip(base * ctx["multiplier"][None, :], 0.0, 100.0)
+
+    return pd.DataFrame(
+        support,
+        index=pd.Index(ids, name="student_id"),
+        columns=pd.Index(schools_df["school_id"].to_numpy(), name="school_id"),
+    )
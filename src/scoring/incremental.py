@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.risk_score import (
+    SIGNAL_COLS,
+    _anchors_from_school_context,
+    _context_multiplier,
+    _group_by_student,
+    _merge_config,
+    _require_columns,
+    _segment_decay_powers,
+    _signal,
+    _summary_frame,
+)
+from src.student_data.schema import week_dates_ns
+
+SNAPSHOT_VERSION = 1
+
+
+class IncrementalScorer:
+    """
+    Running-state version of score_students.
+
+    _recency_weights is geometric, so for each student we only keep
+      - signal_sums[j] = sum(decay_rate ** distance * sig_j)
+      - normalizer     = sum(decay_rate ** distance)
+    Appending k newer weeks multiplies both by decay_rate ** k and adds the
+    new weeks' terms, so an update costs O(new rows), not O(history).
+
+    Weights and threshold are applied when reading results, so they can be
+    changed freely. decay_rate and the school context (anchors) are baked
+    into the state; loading a snapshot under a different one is rejected.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.cfg = _merge_config(config)
+        self.ctx = self.cfg.get("school_context")
+        self.anchors = _anchors_from_school_context(self.ctx)
+        self.multiplier = _context_multiplier(self.ctx)
+
+        self.student_ids = np.array([], dtype=np.int64)
+        self.signal_sums = np.zeros((0, len(SIGNAL_COLS)), dtype=float)
+        self.normalizer = np.zeros(0, dtype=float)
+        self.n_weeks = np.zeros(0, dtype=np.int64)
+        self.last_week = np.zeros(0, dtype="datetime64[ns]")
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> "IncrementalScorer":
+        scorer = cls(config)
+        scorer.update(df)
+        return scorer
+
+    def _last_week_of(self, ids: np.ndarray) -> np.ndarray:
+        """Latest stored week per id (NaT for students not seen yet)."""
+        out = np.full(len(ids), np.datetime64("NaT"), dtype="datetime64[ns]")
+        if len(self.student_ids):
+            idx = np.minimum(np.searchsorted(self.student_ids, ids), len(self.student_ids) - 1)
+            known = self.student_ids[idx] == ids
+            out[known] = self.last_week[idx[known]]
+        return out
+
+    def _grow(self, ids: np.ndarray) -> np.ndarray:
+        """Add unseen student ids to the state; return positions of `ids`."""
+        all_ids = np.union1d(self.student_ids, ids)
+        if len(all_ids) != len(self.student_ids):
+            keep = np.searchsorted(all_ids, self.student_ids)
+            n = len(all_ids)
+
+            signal_sums = np.zeros((n, len(SIGNAL_COLS)), dtype=float)
+            normalizer = np.zeros(n, dtype=float)
+            n_weeks = np.zeros(n, dtype=np.int64)
+            last_week = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+
+            signal_sums[keep] = self.signal_sums
+            normalizer[keep] = self.normalizer
+            n_weeks[keep] = self.n_weeks
+            last_week[keep] = self.last_week
+
+            self.student_ids = all_ids
+            self.signal_sums, self.normalizer = signal_sums, normalizer
+            self.n_weeks, self.last_week = n_weeks, last_week
+
+        return np.searchsorted(self.student_ids, ids)
+
+    def update(self, new_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold newly arrived weekly rows into the state.
+
+        Every row must be dated after the student's latest stored week;
+        backfilled or unparseable weeks raise ValueError (rescore those
+        students from full history instead). Returns summaries for the
+        students touched by this update.
+        """
+        _require_columns(new_rows)
+        week = week_dates_ns(new_rows["week_date"])
+        if np.isnat(week).any():
+            raise ValueError("Incremental update rows must have a valid week_date.")
+
+        order, ids, starts, counts = _group_by_student(new_rows["student_id"].to_numpy(), week)
+        if len(starts) == 0:
+            return self.summary(ids)
+
+        week_sorted = week[order]
+        stale = week_sorted[starts] <= self._last_week_of(ids)
+        if stale.any():
+            raise ValueError(
+                f"{int(stale.sum())} student(s) have rows not newer than their stored weeks; "
+                "incremental updates only append."
+            )
+
+        pos = self._grow(ids)
+
+        powers = _segment_decay_powers(starts, counts, self.cfg["decay_rate"])
+        carry = self.cfg["decay_rate"] ** counts.astype(float)
+
+        batch_sums = np.empty((len(starts), len(SIGNAL_COLS)), dtype=float)
+        for j, col in enumerate(SIGNAL_COLS):
+            sig = _signal(col, new_rows[col].to_numpy(dtype=float)[order], self.anchors)
+            batch_sums[:, j] = np.add.reduceat(sig * powers, starts)
+
+        self.signal_sums[pos] = self.signal_sums[pos] * carry[:, None] + batch_sums
+        self.normalizer[pos] = self.normalizer[pos] * carry + np.add.reduceat(powers, starts)
+        self.n_weeks[pos] += counts
+        self.last_week[pos] = week_sorted[starts + counts - 1]
+
+        return self.summary(ids)
+
+    def replace(self, history: pd.DataFrame) -> pd.DataFrame:
+        """
+        Recompute the state of every student in `history` from those rows
+        alone, which must be each student's full history. This is the path
+        for backfilled weeks, which update() rejects; other students are
+        untouched. Returns summaries for the replaced students.
+        """
+        fresh = IncrementalScorer(self.cfg)
+        fresh.update(history)
+        pos = self._grow(fresh.student_ids)
+        self.signal_sums[pos] = fresh.signal_sums
+        self.normalizer[pos] = fresh.normalizer
+        self.n_weeks[pos] = fresh.n_weeks
+        self.last_week[pos] = fresh.last_week
+        return self.summary(fresh.student_ids)
+
+    def summary(self, student_ids: Optional[np.ndarray] = None, config: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Same columns as score_students. `config` may override weights and
+        threshold; decay_rate and school context come from the state.
+        Raises KeyError for student_ids the state has never seen.
+        """
+        cfg = dict(self.cfg)
+        if config:
+            override = _merge_config(config)
+            cfg["weights"], cfg["threshold"] = override["weights"], override["threshold"]
+
+        if student_ids is None:
+            pos = np.arange(len(self.student_ids))
+        else:
+            ids = np.asarray(student_ids)
+            pos = np.minimum(np.searchsorted(self.student_ids, ids), max(len(self.student_ids) - 1, 0))
+            known = self.student_ids[pos] == ids if len(self.student_ids) else np.zeros(len(ids), dtype=bool)
+            if not known.all():
+                raise KeyError(f"Unknown student_ids: {ids[~known].tolist()}")
+
+        norm = self.normalizer[pos]
+        signals = self.signal_sums[pos] / np.where(norm > 0, norm, 1.0)[:, None]
+        return _summary_frame(
+            self.student_ids[pos], self.n_weeks[pos], self.last_week[pos],
+            signals, cfg, self.ctx, self.anchors, self.multiplier,
+        )
+
+    def save(self, path: str) -> None:
+        """Write the state as a compressed .npz snapshot."""
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "decay_rate": self.cfg["decay_rate"],
+            "threshold": self.cfg["threshold"],
+            "weights": self.cfg["weights"],
+            "school_context": self.ctx,
+        }
+        np.savez_compressed(
+            path,
+            meta=np.array(json.dumps(meta, default=lambda o: o.item() if hasattr(o, "item") else str(o))),
+            student_ids=self.student_ids,
+            signal_sums=self.signal_sums,
+            normalizer=self.normalizer,
+            n_weeks=self.n_weeks,
+            last_week=self.last_week.view("i8"),
+        )
+
+    @classmethod
+    def load(cls, path: str, config: Optional[Dict[str, Any]] = None) -> "IncrementalScorer":
+        """
+        Restore a snapshot. `config` may change weights/threshold; a
+        decay_rate or school context that differs from the snapshot's
+        raises ValueError since the stored sums would no longer apply.
+        """
+        with np.load(path, allow_pickle=False) as snap:
+            meta = json.loads(str(snap["meta"]))
+            if meta.get("version") != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+
+            stored = {k: meta[k] for k in ("decay_rate", "threshold", "weights", "school_context")}
+            scorer = cls({**stored, **(config or {})})
+            if scorer.cfg["decay_rate"] != float(meta["decay_rate"]):
+                raise ValueError("Snapshot was built with a different decay_rate.")
+            if scorer.anchors != _anchors_from_school_context(meta["school_context"]):
+                raise ValueError("Snapshot was built with a different school context.")
+
+            scorer.student_ids = snap["student_ids"]
+            scorer.signal_sums = snap["signal_sums"]
+            scorer.normalizer = snap["normalizer"]
+            scorer.n_weeks = snap["n_weeks"]
+            scorer.last_week = snap["last_week"].view("datetime64[ns]")
+
+        return scorer
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.risk_score import (
+    SIGNAL_COLS,
+    _anchors_from_school_context,
+    _context_multiplier,
+    _merge_config,
+    _recency_signal_matrix,
+    _require_columns,
+    _summary_frame,
+    _summary_records,
+)
+from src.student_data.schema import week_dates_ns
+
+# Below this many rows, process start-up costs more than it saves.
+MIN_PARALLEL_ROWS = 200_000
+
+
+def _score_shard(payload: Dict[str, np.ndarray], decay_rate: float, anchors: Dict[str, float]):
+    """Worker: score one shard given as plain arrays (student codes, int64 weeks, metrics)."""
+    metrics = {col: payload[col] for col in SIGNAL_COLS}
+    codes, n_weeks, latest, signals = _recency_signal_matrix(
+        payload["code"], payload["week"].view("datetime64[ns]"), metrics, decay_rate, anchors
+    )
+    return codes, n_weeks, latest.view("i8"), signals
+
+
+def _shard_payloads(codes: np.ndarray, uniques, week: np.ndarray, metrics: Dict[str, np.ndarray], n_shards: int):
+    """Split rows into n_shards array payloads by a hash of student_id."""
+    student_shard = (pd.util.hash_array(np.asarray(uniques)) % np.uint64(n_shards)).astype(np.int64)
+    keep = codes >= 0
+    row_shard = np.where(keep, student_shard[np.where(keep, codes, 0)], -1)
+
+    order = np.argsort(row_shard, kind="stable")
+    bounds = np.searchsorted(row_shard[order], np.arange(n_shards + 1))
+    for s in range(n_shards):
+        rows = order[bounds[s]:bounds[s + 1]]
+        if len(rows) == 0:
+            continue
+        payload = {"code": codes[rows], "week": week[rows].view("i8")}
+        for col in SIGNAL_COLS:
+            payload[col] = metrics[col][rows]
+        yield payload
+
+
+def score_students_parallel(
+    df: pd.DataFrame,
+    config: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    n_shards: Optional[int] = None,
+    as_records: bool = False,
+    pool: Optional[Executor] = None,
+):
+    """
+    score_students across a process pool.
+
+    Students are hash-sharded by student_id into n_shards (default: 4 per
+    worker, for load balance). Each worker receives only NumPy arrays
+    (integer student codes, int64 weeks, metric columns), never a pickled
+    DataFrame. Results are merged in student_id order, so the output is
+    identical to score_students regardless of worker count (as_records as
+    in score_students). Pass `pool` to reuse one executor across calls (as
+    run_batch does per chunk) instead of starting a new one each time.
+    """
+    cfg = _merge_config(config)
+    _require_columns(df)
+    ctx = cfg.get("school_context")
+    anchors = _anchors_from_school_context(ctx)
+    multiplier = _context_multiplier(ctx)
+
+    workers = workers or os.cpu_count() or 1
+    n_shards = n_shards or workers * 4
+
+    codes, uniques = pd.factorize(df["student_id"].to_numpy(), sort=True)
+    week = week_dates_ns(df["week_date"])
+    metrics = {col: df[col].to_numpy(dtype=float) for col in SIGNAL_COLS}
+    payloads = _shard_payloads(codes, uniques, week, metrics, n_shards)
+
+    if workers <= 1 or len(df) < MIN_PARALLEL_ROWS:
+        parts = [_score_shard(p, cfg["decay_rate"], anchors) for p in payloads]
+    else:
+        with (nullcontext(pool) if pool is not None else ProcessPoolExecutor(max_workers=workers)) as executor:
+            futures = [executor.submit(_score_shard, p, cfg["decay_rate"], anchors) for p in payloads]
+            parts = [f.result() for f in futures]
+
+    if parts:
+        shard_codes = np.concatenate([p[0] for p in parts])
+        order = np.argsort(shard_codes, kind="stable")
+        n_weeks = np.concatenate([p[1] for p in parts])[order]
+        latest = np.concatenate([p[2] for p in parts])[order].view("datetime64[ns]")
+        signals = np.concatenate([p[3] for p in parts])[order]
+        ids = uniques[shard_codes[order]]
+    else:
+        n_weeks = np.array([], dtype=np.int64)
+        latest = np.array([], dtype="datetime64[ns]")
+        signals = np.zeros((0, len(SIGNAL_COLS)))
+        ids = uniques[:0]
+
+    if as_records:
+        return _summary_records(ids, n_weeks, latest, signals, cfg, multiplier)
+    return _summary_frame(ids, n_weeks, latest, signals, cfg, ctx, anchors, multiplier)
@@ -4,6 +4,9 @@ from typing import Dict, Any, Optional
 import pandas as pd
 import numpy as np
 
+from src.profiling import stage
+from src.student_data.schema import parse_week_dates, week_dates_ns
+
 DEFAULT_CONFIG: Dict[str, Any] = {
     "threshold": 75,
     "decay_rate": 0.85,
@@ -44,19 +47,35 @@ def _require_columns(df: pd.DataFrame) -> None:
         raise ValueError(f"Missing required columns: {missing}")
 
 
-def _normalize_negative(x: float, good_low: float, bad_high: float) -> float:
-    if pd.isna(x):
-        return 0.0
+SIGNAL_COLS = ["grades", "tardies", "absences", "discipline_events", "truancy_days"]
+
+# Which school-context anchor caps each "higher is worse" metric.
+ANCHOR_KEYS = {
+    "tardies": "tardies_bad",
+    "absences": "absences_bad",
+    "discipline_events": "discipline_bad",
+    "truancy_days": "truancy_bad",
+}
+
+
+def _normalize_negative(x: np.ndarray, good_low: float, bad_high: float) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
     if bad_high <= good_low:
-        return 0.0
-    return float(np.clip((float(x) - good_low) / (bad_high - good_low), 0.0, 1.0))
+        return np.zeros(x.shape, dtype=float)
+    out = np.clip((x - good_low) / (bad_high - good_low), 0.0, 1.0)
+    return np.where(np.isnan(x), 0.0, out)
 
 
-def _normalize_grades(g: float) -> float:
-    if pd.isna(g):
-        return 0.0
-    g = float(np.clip(float(g), 0.0, 100.0))
-    return float(np.clip((100.0 - g) / 100.0, 0.0, 1.0))
+def _normalize_grades(g: np.ndarray) -> np.ndarray:
+    g = np.asarray(g, dtype=float)
+    out = np.clip((100.0 - np.clip(g, 0.0, 100.0)) / 100.0, 0.0, 1.0)
+    return np.where(np.isnan(g), 0.0, out)
+
+
+def _signal(col: str, values: np.ndarray, anchors: Dict[str, float]) -> np.ndarray:
+    if col == "grades":
+        return _normalize_grades(values)
+    return _normalize_negative(values, 0, anchors[ANCHOR_KEYS[col]])
 
 
 def _recency_weights(n: int, decay_rate: float) -> np.ndarray:
@@ -69,6 +88,10 @@ def _recency_weights(n: int, decay_rate: float) -> np.ndarray:
 
 
 def _anchors_from_school_context(ctx: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    # Precomputed by SchoolContextRegistry
+    if getattr(ctx, "anchors", None) is not None:
+        return dict(ctx.anchors)
+
     # Defaults
     anchors = {
         "tardies_bad": 5.0,
@@ -98,6 +121,8 @@ def _context_multiplier(ctx: Optional[Dict[str, Any]]) -> float:
     """
     if not isinstance(ctx, dict):
         return 1.0
+    if getattr(ctx, "multiplier", None) is not None:
+        return ctx.multiplier
 
     abs_pct = float(ctx.get("chronic_absenteeism_pct", 0) or 0)
     tru_pct = float(ctx.get("truancy_rate_pct", 0) or 0)
@@ -117,24 +142,37 @@ def _context_multiplier(ctx: Optional[Dict[str, Any]]) -> float:
 
 
 def score_dataframe(student_df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
-    cfg = _merge_config(config)
-    _require_columns(student_df)
-
-    df = student_df.copy()
-    df["week_date"] = pd.to_datetime(df["week_date"], errors="coerce")
-    df = df.sort_values("week_date")
-
-    w_rec = _recency_weights(len(df), cfg["decay_rate"])
-    ctx = cfg.get("school_context")
-    anchors = _anchors_from_school_context(ctx)
-    multiplier = _context_multiplier(ctx)
+    """
+    Score one student's timeline (every row is treated as the same student):
+    the sorted input with per-row sig_* / contrib_* columns and the summary
+    values broadcast onto every row. score_student_summary returns just the
+    compact summary record.
+    """
+    n = len(student_df)
+    with stage("score.merge_config"):
+        cfg = _merge_config(config)
+        _require_columns(student_df)
+
+    with stage("score.copy", rows=n) as s:
+        df = student_df.copy()
+        s.add_bytes(lambda: df.memory_usage(deep=False).sum())
+    with stage("score.coerce_dates", rows=n):
+        df["week_date"] = parse_week_dates(df["week_date"])
+    with stage("score.sort", rows=n):
+        df = df.sort_values("week_date")
+
+    with stage("score.recency_weights", rows=n):
+        w_rec = _recency_weights(len(df), cfg["decay_rate"])
+    with stage("score.context"):
+        ctx = cfg.get("school_context")
+        anchors = _anchors_from_school_context(ctx)
+        multiplier = _context_multiplier(ctx)
 
     # signals
-    df["sig_grades"] = df["grades"].apply(_normalize_grades)
-    df["sig_tardies"] = df["tardies"].apply(lambda x: _normalize_negative(x, 0, anchors["tardies_bad"]))
-    df["sig_absences"] = df["absences"].apply(lambda x: _normalize_negative(x, 0, anchors["absences_bad"]))
-    df["sig_discipline_events"] = df["discipline_events"].apply(lambda x: _normalize_negative(x, 0, anchors["discipline_bad"]))
-    df["sig_truancy_days"] = df["truancy_days"].apply(lambda x: _normalize_negative(x, 0, anchors["truancy_bad"]))
+    with stage("score.normalize", rows=n) as s:
+        for col in SIGNAL_COLS:
+            df[f"sig_{col}"] = _signal(col, df[col].to_numpy(dtype=float), anchors)
+        s.add_bytes(8 * n * len(SIGNAL_COLS))
 
     weights = cfg["weights"]
     w_grades = float(weights.get("grades", 0.0))
@@ -143,27 +181,30 @@ def score_dataframe(student_df: pd.DataFrame, config: Optional[Dict[str, Any]] =
     w_disc = float(weights.get("discipline_events", 0.0))
     w_truancy = float(weights.get("truancy_days", 0.0))
 
-    df["contrib_grades"] = df["sig_grades"] * w_grades
-    df["contrib_tardies"] = df["sig_tardies"] * w_tardies
-    df["contrib_absences"] = df["sig_absences"] * w_absences
-    df["contrib_discipline_events"] = df["sig_discipline_events"] * w_disc
-    df["contrib_truancy_days"] = df["sig_truancy_days"] * w_truancy
-
-    df["row_signal"] = (
-        df["contrib_grades"]
-        + df["contrib_tardies"]
-        + df["contrib_absences"]
-        + df["contrib_discipline_events"]
-        + df["contrib_truancy_days"]
-    )
-
-    overall_contribs = {
-        "grades": float(np.dot(df["contrib_grades"].to_numpy(dtype=float), w_rec)),
-        "tardies": float(np.dot(df["contrib_tardies"].to_numpy(dtype=float), w_rec)),
-        "absences": float(np.dot(df["contrib_absences"].to_numpy(dtype=float), w_rec)),
-        "discipline_events": float(np.dot(df["contrib_discipline_events"].to_numpy(dtype=float), w_rec)),
-        "truancy_days": float(np.dot(df["contrib_truancy_days"].to_numpy(dtype=float), w_rec)),
-    }
+    with stage("score.contributions", rows=n) as s:
+        df["contrib_grades"] = df["sig_grades"] * w_grades
+        df["contrib_tardies"] = df["sig_tardies"] * w_tardies
+        df["contrib_absences"] = df["sig_absences"] * w_absences
+        df["contrib_discipline_events"] = df["sig_discipline_events"] * w_disc
+        df["contrib_truancy_days"] = df["sig_truancy_days"] * w_truancy
+
+        df["row_signal"] = (
+            df["contrib_grades"]
+            + df["contrib_tardies"]
+            + df["contrib_absences"]
+            + df["contrib_discipline_events"]
+            + df["contrib_truancy_days"]
+        )
+        s.add_bytes(8 * n * (len(SIGNAL_COLS) + 1))
+
+    with stage("score.recency_dot", rows=n):
+        overall_contribs = {
+            "grades": float(np.dot(df["contrib_grades"].to_numpy(dtype=float), w_rec)),
+            "tardies": float(np.dot(df["contrib_tardies"].to_numpy(dtype=float), w_rec)),
+            "absences": float(np.dot(df["contrib_absences"].to_numpy(dtype=float), w_rec)),
+            "discipline_events": float(np.dot(df["contrib_discipline_events"].to_numpy(dtype=float), w_rec)),
+            "truancy_days": float(np.dot(df["contrib_truancy_days"].to_numpy(dtype=float), w_rec)),
+        }
 
     total_weight = w_grades + w_tardies + w_absences + w_disc + w_truancy
     overall = float(sum(overall_contribs.values()))
@@ -172,21 +213,261 @@ def score_dataframe(student_df: pd.DataFrame, config: Optional[Dict[str, Any]] =
     # Apply context calibration so school changes affect score
     support_signal = float(np.clip(base_score * multiplier, 0.0, 100.0))
 
-    df["support_signal"] = support_signal
-    df["recommendation"] = "review" if support_signal >= cfg["threshold"] else "no_review"
+    with stage("score.broadcast_summary", rows=n) as s:
+        n_cols = len(df.columns)
+        df["support_signal"] = support_signal
+        df["recommendation"] = "review" if support_signal >= cfg["threshold"] else "no_review"
 
-    # Attach overall contributions
-    df["contrib_overall_grades"] = overall_contribs["grades"]
-    df["contrib_overall_tardies"] = overall_contribs["tardies"]
-    df["contrib_overall_absences"] = overall_contribs["absences"]
-    df["contrib_overall_discipline_events"] = overall_contribs["discipline_events"]
-    df["contrib_overall_truancy_days"] = overall_contribs["truancy_days"]
+        # Attach overall contributions
+        df["contrib_overall_grades"] = overall_contribs["grades"]
+        df["contrib_overall_tardies"] = overall_contribs["tardies"]
+        df["contrib_overall_absences"] = overall_contribs["absences"]
+        df["contrib_overall_discipline_events"] = overall_contribs["discipline_events"]
+        df["contrib_overall_truancy_days"] = overall_contribs["truancy_days"]
 
-    # Transparency columns for UI/debug
-    df["context_school_name"] = str(ctx.get("school_name")) if isinstance(ctx, dict) and "school_name" in ctx else "None selected"
-    df["context_multiplier"] = multiplier
-    df["context_absences_bad_anchor"] = anchors["absences_bad"]
-    df["context_truancy_bad_anchor"] = anchors["truancy_bad"]
-    df["context_discipline_bad_anchor"] = anchors["discipline_bad"]
+        # Transparency columns for UI/debug
+        for k, v in _context_columns(ctx, anchors, multiplier).items():
+            df[k] = v
+        s.add_bytes(8 * n * (len(df.columns) - n_cols))
 
     return df
+
+
+def score_student_summary(student_df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """
+    Score one student's timeline as a one-record summary array (see
+    summary_dtype) without building score_dataframe's row-level frame. The
+    per-run context (school name, multiplier, anchors) is available once
+    from summary_context(config).
+    """
+    cfg = _merge_config(config)
+    _require_columns(student_df)
+    return _score_one_student_records(student_df, cfg)
+
+
+def _score_one_student_records(student_df: pd.DataFrame, cfg: Dict[str, Any]) -> np.ndarray:
+    ctx = cfg.get("school_context")
+    anchors = _anchors_from_school_context(ctx)
+    week = week_dates_ns(student_df["week_date"])
+    metrics = {col: student_df[col].to_numpy(dtype=float) for col in SIGNAL_COLS}
+    _, n_weeks, latest, signals = _recency_signal_matrix(
+        np.zeros(len(student_df), dtype=np.int64), week, metrics, cfg["decay_rate"], anchors
+    )
+    ids = student_df["student_id"].to_numpy()[:1] if len(n_weeks) else student_df["student_id"].to_numpy()[:0]
+    return _summary_records(ids, n_weeks, latest, signals, cfg, _context_multiplier(ctx))
+
+
+def summary_context(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The per-run context values (constant across students) for a config."""
+    ctx = _merge_config(config).get("school_context")
+    return _context_columns(ctx, _anchors_from_school_context(ctx), _context_multiplier(ctx))
+
+
+def _context_columns(ctx: Optional[Dict[str, Any]], anchors: Dict[str, float], multiplier: float) -> Dict[str, Any]:
+    return {
+        "context_school_name": str(ctx.get("school_name")) if isinstance(ctx, dict) and "school_name" in ctx else "None selected",
+        "context_multiplier": multiplier,
+        "context_absences_bad_anchor": anchors["absences_bad"],
+        "context_truancy_bad_anchor": anchors["truancy_bad"],
+        "context_discipline_bad_anchor": anchors["discipline_bad"],
+    }
+
+
+def _segment_decay_powers(starts: np.ndarray, counts: np.ndarray, decay_rate: float) -> np.ndarray:
+    """Unnormalized decay_rate ** distance-from-latest for grouped rows."""
+    n = int(counts.sum())
+    if n == 0:
+        return np.array([], dtype=float)
+    pos = np.arange(n) - np.repeat(starts, counts)
+    distances = np.repeat(counts, counts) - 1 - pos
+    return (decay_rate ** distances).astype(float)
+
+
+def _segment_recency_weights(starts: np.ndarray, counts: np.ndarray, decay_rate: float) -> np.ndarray:
+    """
+    Per-student version of _recency_weights for rows already grouped by
+    student (contiguous) and sorted by week inside each group.
+    """
+    w = _segment_decay_powers(starts, counts, decay_rate)
+    if len(w) == 0:
+        return w
+    norm = np.repeat(np.add.reduceat(w, starts), counts)
+    uniform = 1.0 / np.repeat(counts, counts)
+    return np.where(norm > 0, w / np.where(norm > 0, norm, 1.0), uniform)
+
+
+def _group_by_student(student_ids: np.ndarray, week_ns: np.ndarray):
+    """
+    Order rows by (student_id, week_date) with unparseable dates last, the way
+    score_dataframe's sort leaves them. Rows without a student_id are dropped.
+
+    Returns (order, unique_ids, starts, counts).
+    """
+    codes, uniques = pd.factorize(student_ids, sort=True)
+    week_i8 = week_ns.view("i8")
+    nat = np.isnat(week_ns)
+    order = np.lexsort((week_i8, nat, codes))
+    order = order[codes[order] >= 0]
+
+    codes_sorted = codes[order]
+    if len(codes_sorted) == 0:
+        empty = np.array([], dtype=np.int64)
+        return order, uniques[:0], empty, empty
+    boundary = np.empty(len(codes_sorted), dtype=bool)
+    boundary[0] = True
+    np.not_equal(codes_sorted[1:], codes_sorted[:-1], out=boundary[1:])
+    starts = np.flatnonzero(boundary)
+    counts = np.diff(np.append(starts, len(codes_sorted)))
+    return order, uniques[codes_sorted[starts]], starts, counts
+
+
+def _recency_signal_matrix(
+    student_ids: np.ndarray,
+    week_ns: np.ndarray,
+    metrics: Dict[str, np.ndarray],
+    decay_rate: float,
+    anchors: Dict[str, float],
+):
+    """
+    Array core of score_students.
+
+    Returns (unique_ids, n_weeks, latest_week, signals) where signals is a
+    students x len(SIGNAL_COLS) matrix of recency-weighted normalized signals
+    (weights not applied yet).
+    """
+    n = len(student_ids)
+    with stage("score_students.group_sort", rows=n):
+        order, uniques, starts, counts = _group_by_student(student_ids, week_ns)
+    with stage("score_students.recency_weights", rows=n) as s:
+        w_rec = _segment_recency_weights(starts, counts, decay_rate)
+        s.add_bytes(w_rec.nbytes)
+
+    signals = np.zeros((len(starts), len(SIGNAL_COLS)), dtype=float)
+    if len(starts):
+        with stage("score_students.normalize_reduce", rows=n) as s:
+            for j, col in enumerate(SIGNAL_COLS):
+                sig = _signal(col, metrics[col][order], anchors)
+                signals[:, j] = np.add.reduceat(sig * w_rec, starts)
+            s.add_bytes(signals.nbytes + 8 * n)
+        # NaT is the smallest int64, so the max skips it unless every week is NaT.
+        latest = np.maximum.reduceat(week_ns.view("i8")[order], starts).view("datetime64[ns]")
+    else:
+        latest = np.array([], dtype="datetime64[ns]")
+
+    return uniques, counts, latest, signals
+
+
+def _support_from_signals(signals: np.ndarray, weights: Dict[str, float], multiplier: float):
+    """Apply weights and context calibration to a students x signals matrix."""
+    w = np.array([float(weights.get(col, 0.0)) for col in SIGNAL_COLS])
+    contribs = signals * w
+    total_weight = float(w.sum())
+    if total_weight <= 0:
+        base = np.zeros(len(signals))
+    else:
+        base = np.clip((contribs.sum(axis=1) / total_weight) * 100.0, 0.0, 100.0)
+    support = np.clip(base * multiplier, 0.0, 100.0)
+    return contribs, support
+
+
+def score_students(
+    df: pd.DataFrame,
+    config: Optional[Dict[str, Any]] = None,
+    as_records: bool = False,
+):
+    """
+    Batch version of score_dataframe: scores every student in `df` in one
+    vectorized pass and returns one summary row per student_id.
+
+    Values match the per-student columns score_dataframe
+    attaches (support_signal, recommendation, contrib_overall_*, context_*).
+    as_records=True returns a compact structured array instead (see
+    summary_dtype); context values are then left to summary_context.
+    """
+    cfg = _merge_config(config)
+    _require_columns(df)
+
+    ctx = cfg.get("school_context")
+    anchors = _anchors_from_school_context(ctx)
+    multiplier = _context_multiplier(ctx)
+
+    with stage("score_students.coerce_dates", rows=len(df)):
+        week = week_dates_ns(df["week_date"])
+        metrics = {col: df[col].to_numpy(dtype=float) for col in SIGNAL_COLS}
+
+    ids, n_weeks, latest, signals = _recency_signal_matrix(
+        df["student_id"].to_numpy(), week, metrics, cfg["decay_rate"], anchors
+    )
+    with stage("score_students.summary", rows=len(ids)):
+        if as_records:
+            return _summary_records(ids, n_weeks, latest, signals, cfg, multiplier)
+        return _summary_frame(ids, n_weeks, latest, signals, cfg, ctx, anchors, multiplier)
+
+
+def summary_dtype(id_dtype=np.int64, float_dtype=np.float32) -> np.dtype:
+    """
+    Record layout of compact per-student summaries: 45 bytes per student
+    with int64 ids, float32 scores and a boolean review flag. Pass
+    float_dtype=np.float64 where values are shown rather than stored.
+    """
+    return np.dtype(
+        [
+            ("student_id", id_dtype),
+            ("n_weeks", np.int32),
+            ("latest_week_date", "datetime64[ns]"),
+            ("support_signal", float_dtype),
+            ("review", np.bool_),
+        ]
+        + [(f"contrib_overall_{col}", float_dtype) for col in SIGNAL_COLS]
+    )
+
+
+def _summary_records(
+    ids: np.ndarray,
+    n_weeks: np.ndarray,
+    latest: np.ndarray,
+    signals: np.ndarray,
+    cfg: Dict[str, Any],
+    multiplier: float,
+    float_dtype=np.float32,
+) -> np.ndarray:
+    contribs, support = _support_from_signals(signals, cfg["weights"], multiplier)
+
+    ids = np.asarray(ids)
+    id_dtype = ids.dtype if ids.dtype.kind in "iu" else object
+    out = np.empty(len(ids), dtype=summary_dtype(id_dtype, float_dtype))
+    out["student_id"] = ids
+    out["n_weeks"] = n_weeks
+    out["latest_week_date"] = latest
+    out["support_signal"] = support
+    out["review"] = support >= cfg["threshold"]
+    for j, col in enumerate(SIGNAL_COLS):
+        out[f"contrib_overall_{col}"] = contribs[:, j]
+    return out
+
+
+def _summary_frame(
+    ids: np.ndarray,
+    n_weeks: np.ndarray,
+    latest: np.ndarray,
+    signals: np.ndarray,
+    cfg: Dict[str, Any],
+    ctx: Optional[Dict[str, Any]],
+    anchors: Dict[str, float],
+    multiplier: float,
+) -> pd.DataFrame:
+    contribs, support = _support_from_signals(signals, cfg["weights"], multiplier)
+
+    out = pd.DataFrame({
+        "student_id": ids,
+        "n_weeks": n_weeks,
+        "latest_week_date": latest,
+        "support_signal": support,
+        "recommendation": np.where(support >= cfg["threshold"], "review", "no_review"),
+    })
+    for j, col in enumerate(SIGNAL_COLS):
+        out[f"contrib_overall_{col}"] = contribs[:, j]
+    for k, v in _context_columns(ctx, anchors, multiplier).items():
+        out[k] = v
+
+    return out
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.scoring.risk_score import _anchors_from_school_context, _context_multiplier
+
+SCHOOLS_PATH = "data/schools_context.csv"
+
+# School columns averaged into the academic benchmark grades are compared to.
+ACADEMIC_COLS = ["math_achievement_pct", "ela_achievement_pct", "science_achievement_pct"]
+
+
+class SchoolContext(dict):
+    """
+    One schools_context.csv row, usable anywhere a school_context dict is
+    (config["school_context"], st.json, ...), with its derived values
+    precomputed: scoring anchors, context multiplier and academic average.
+    """
+
+    def __init__(self, row: Dict[str, Any]):
+        super().__init__(row)
+        self.anchors = _anchors_from_school_context(dict(row))
+        self.multiplier = _context_multiplier(dict(row))
+        self.academic_avg = (
+            float(sum(row[c] for c in ACADEMIC_COLS) / len(ACADEMIC_COLS))
+            if all(c in row for c in ACADEMIC_COLS) else None
+        )
+
+
+class SchoolContextRegistry:
+    """
+    Context schools keyed by school_id and school_name, loaded once and
+    reloaded only when the CSV's mtime changes. Use get_school_registry()
+    for the shared per-process instance.
+    """
+
+    def __init__(self, path: Optional[str] = SCHOOLS_PATH, frame: Optional[pd.DataFrame] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime_ns: Optional[int] = None
+        self._version = 0
+        self._state: Tuple[pd.DataFrame, Dict[int, SchoolContext], Dict[str, SchoolContext]]
+        if frame is not None:
+            self._state = self._build(frame)
+        else:
+            self._state = self._load()
+
+    @classmethod
+    def from_frame(cls, schools_df: pd.DataFrame) -> "SchoolContextRegistry":
+        """Registry over an in-memory frame (never reloads)."""
+        return cls(path=None, frame=schools_df)
+
+    @staticmethod
+    def _build(schools_df: pd.DataFrame):
+        missing = [c for c in ("school_id", "school_name") if c not in schools_df.columns]
+        if missing:
+            raise ValueError(f"School context data must include columns: {missing}")
+        by_id: Dict[int, SchoolContext] = {}
+        by_name: Dict[str, SchoolContext] = {}
+        for row in schools_df.to_dict("records"):
+            school = SchoolContext(row)
+            by_id.setdefault(int(row["school_id"]), school)
+            by_name.setdefault(str(row["school_name"]), school)
+        return schools_df, by_id, by_name
+
+    def _load(self):
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        state = self._build(pd.read_csv(self.path))
+        self._mtime_ns = mtime_ns
+        self._version += 1
+        return state
+
+    def _current(self):
+        if self.path is None:
+            return self._state
+        with self._lock:
+            if os.stat(self.path).st_mtime_ns != self._mtime_ns:
+                self._state = self._load()
+            return self._state
+
+    @property
+    def version(self) -> int:
+        """Bumped on every reload; part of cache keys for results built from the schools."""
+        self._current()
+        return self._version
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The schools table as read (treat as read-only)."""
+        return self._current()[0]
+
+    def names(self) -> List[str]:
+        return list(self._current()[2])
+
+    def get(self, school_id) -> SchoolContext:
+        try:
+            return self._current()[1][int(school_id)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"school_id {school_id} not found in {self.path or 'school context data'}") from None
+
+    def by_name(self, school_name: str) -> SchoolContext:
+        try:
+            return self._current()[2][str(school_name)]
+        except KeyError:
+            raise ValueError(f"school_name {school_name!r} not found in {self.path or 'school context data'}") from None
+
+    def lookup(self, school) -> SchoolContext:
+        """Match by school_id first, then by school_name."""
+        try:
+            return self.get(school)
+        except ValueError:
+            return self.by_name(school)
+
+    def __contains__(self, school_id) -> bool:
+        try:
+            self.get(school_id)
+        except ValueError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._current()[1])
+
+
+_REGISTRIES: Dict[str, SchoolContextRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_school_registry(path: str = SCHOOLS_PATH) -> SchoolContextRegistry:
+    """The process-wide registry for `path` (created on first use)."""
+    key = os.path.abspath(path)
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = _REGISTRIES[key] = SchoolContextRegistry(path)
+    return registry
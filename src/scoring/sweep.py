@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.risk_score import (
+    SIGNAL_COLS,
+    _anchors_from_school_context,
+    _context_multiplier,
+    _merge_config,
+    _recency_signal_matrix,
+    _require_columns,
+)
+from src.student_data.schema import week_dates_ns
+
+# Configs are scored in blocks so a students x configs matrix never has to
+# exist all at once.
+CONFIG_BLOCK = 64
+
+# Median / p90 come from a histogram of the 0..100 signal at this many bins
+# per point (0.1 resolution), which is far cheaper than sorting each column.
+BINS_PER_POINT = 10
+
+
+def recency_signal_matrix(
+    df: pd.DataFrame, config: Optional[Dict[str, Any]] = None
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    The weight-independent part of scoring: (student_ids, signals,
+    multiplier) where signals is students x len(SIGNAL_COLS) recency-weighted
+    normalized signals. Depends only on decay_rate and school context.
+    """
+    cfg = _merge_config(config)
+    _require_columns(df)
+    ctx = cfg.get("school_context")
+
+    week = week_dates_ns(df["week_date"])
+    metrics = {col: df[col].to_numpy(dtype=float) for col in SIGNAL_COLS}
+    ids, _, _, signals = _recency_signal_matrix(
+        df["student_id"].to_numpy(), week, metrics, cfg["decay_rate"], _anchors_from_school_context(ctx)
+    )
+    return ids, signals, _context_multiplier(ctx)
+
+
+def candidate_weights(base_weights: Dict[str, float], step: float = 0.05) -> pd.DataFrame:
+    """
+    One-at-a-time perturbations of `base_weights`: each metric moved up and
+    down by `step` (not below 0), then rescaled to the base weights' total,
+    so only the mix changes, not the overall scale (unscaled when the base
+    is all zero). Row 0 is the base itself.
+    """
+    base = np.array([float(base_weights.get(c, 0.0)) for c in SIGNAL_COLS])
+    rows, labels = [base], ["current"]
+    for j, col in enumerate(SIGNAL_COLS):
+        for sign, tag in ((1, "+"), (-1, "-")):
+            w = base.copy()
+            w[j] = max(0.0, w[j] + sign * step)
+            if w.sum() > 0:
+                rows.append(w / w.sum() * base.sum() if base.sum() > 0 else w)
+                labels.append(f"{col} {tag}{step:.2f}")
+    return pd.DataFrame(rows, columns=SIGNAL_COLS, index=pd.Index(labels, name="config"))
+
+
+def sweep_weights(
+    signals: np.ndarray,
+    weight_matrix: np.ndarray,
+    multiplier: float = 1.0,
+    threshold: float = 75,
+) -> pd.DataFrame:
+    """
+    Score every student under K weight vectors at once.
+
+    weight_matrix is K x len(SIGNAL_COLS) (or a DataFrame with SIGNAL_COLS
+    columns). Per config returns the support_signal mean / median / p90
+    (to within 1 / BINS_PER_POINT) and how many students would reach
+    `threshold` (review_count).
+    """
+    labels = None
+    if isinstance(weight_matrix, pd.DataFrame):
+        labels = weight_matrix.index
+        weight_matrix = weight_matrix[SIGNAL_COLS].to_numpy(dtype=float)
+    W = np.asarray(weight_matrix, dtype=float).T  # signals x K
+    total = W.sum(axis=0)
+    scale = np.where(total > 0, 100.0 / np.where(total > 0, total, 1.0), 0.0)
+
+    sig = signals.astype(np.float32)
+    K = W.shape[1]
+    n_bins = 100 * BINS_PER_POINT + 1
+    hist = np.zeros((K, n_bins), dtype=np.int64)
+    mean, review = np.zeros(K), np.zeros(K)
+    for lo in range(0, K, CONFIG_BLOCK):
+        hi = min(lo + CONFIG_BLOCK, K)
+        scores = sig @ (W[:, lo:hi] * scale[lo:hi]).astype(np.float32)
+        np.clip(scores, 0.0, 100.0, out=scores)
+        scores *= multiplier
+        np.clip(scores, 0.0, 100.0, out=scores)
+
+        if len(scores):
+            mean[lo:hi] = scores.mean(axis=0)
+        review[lo:hi] = (scores >= threshold).sum(axis=0)
+
+        bins = (scores * BINS_PER_POINT).astype(np.int64) + np.arange(hi - lo) * n_bins
+        hist[lo:hi] = np.bincount(bins.ravel(), minlength=(hi - lo) * n_bins).reshape(hi - lo, n_bins)
+
+    cum = hist.cumsum(axis=1)
+    n = len(signals)
+    p50 = (cum < 0.5 * n).sum(axis=1) / BINS_PER_POINT
+    p90 = (cum < 0.9 * n).sum(axis=1) / BINS_PER_POINT
+
+    out = pd.DataFrame({
+        "mean_signal": mean,
+        "median_signal": p50,
+        "p90_signal": p90,
+        "review_count": review.astype(int),
+    }, index=labels)
+    for j, col in enumerate(SIGNAL_COLS):
+        out.insert(j, f"w_{col}", W[j])
+    return out
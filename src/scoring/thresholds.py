@@ -1,6 +1,64 @@
 # src/scoring/thresholds.py
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.context_matrix import score_students_by_school
 
 DEFAULT_THRESHOLD = 75  # out of 100
 
 def needs_check_in(score_0_to_100: float, threshold: float = DEFAULT_THRESHOLD) -> bool:
     return float(score_0_to_100) >= float(threshold)
+
+
+class ScoreIndex:
+    """
+    A cohort's support signals under one context school, sorted once as
+    float32. Review counts for any threshold are a searchsorted away, so
+    moving the threshold never rescores anyone.
+
+    Scores are rounded *down* to float32, so for any threshold that is
+    itself a float32 (every slider value) the counts agree exactly with
+    needs_check_in on the float64 scores.
+    """
+
+    def __init__(self, support_signals):
+        x = np.asarray(support_signals, dtype=float)
+        x = x[~np.isnan(x)]
+        f32 = x.astype(np.float32)
+        f32 = np.where(f32 > x, np.nextafter(f32, np.float32(-np.inf)), f32)
+        self.scores = np.sort(f32)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def review_count(self, threshold: float = DEFAULT_THRESHOLD) -> int:
+        """Students with support_signal >= threshold."""
+        return len(self.scores) - int(np.searchsorted(self.scores, np.float32(threshold), side="left"))
+
+    def review_counts(self, thresholds) -> np.ndarray:
+        t = np.asarray(thresholds, dtype=np.float32)
+        return len(self.scores) - np.searchsorted(self.scores, t, side="left")
+
+    def curve(self, thresholds=None) -> pd.DataFrame:
+        """Review count and share for each threshold (default 0..100)."""
+        t = np.arange(0, 101) if thresholds is None else np.asarray(thresholds)
+        counts = self.review_counts(t)
+        return pd.DataFrame({
+            "threshold": t,
+            "review_count": counts,
+            "review_share": counts / max(len(self.scores), 1),
+        })
+
+
+def build_score_indexes(
+    df: pd.DataFrame,
+    schools_df: pd.DataFrame,
+    config: Optional[Dict[str, Any]] = None,
+) -> Dict[Any, ScoreIndex]:
+    """One ScoreIndex per context school (keyed by school_id), from a single scoring run."""
+    by_school = score_students_by_school(df, schools_df, config)
+    return {school_id: ScoreIndex(by_school[school_id].to_numpy()) for school_id in by_school.columns}
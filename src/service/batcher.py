@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.parallel import _score_shard
+from src.scoring.risk_score import (
+    REQUIRED_COLS,
+    SIGNAL_COLS,
+    _anchors_from_school_context,
+    _context_multiplier,
+    _merge_config,
+    _summary_records,
+)
+from src.student_data.schema import week_dates_ns
+
+DEFAULT_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH_ROWS = 200_000
+LATENCY_SAMPLES = 10_000
+
+
+@dataclass
+class _Pending:
+    """One request's rows as arrays, waiting for the next batch."""
+    codes: np.ndarray
+    uniques: np.ndarray
+    week: np.ndarray
+    metrics: Dict[str, np.ndarray]
+    school: Optional[Any]
+    future: asyncio.Future
+
+
+@dataclass
+class ServiceMetrics:
+    """Request, batch and latency counters exposed at /metrics."""
+
+    started_at: float = field(default_factory=time.time)
+    requests: Dict[str, int] = field(default_factory=dict)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    batches: int = 0
+    batched_requests: int = 0
+    batched_rows: int = 0
+    max_batch_requests: int = 0
+    latencies_ms: Dict[str, Deque[float]] = field(default_factory=dict)
+
+    def record_request(self, endpoint: str, status: int, seconds: float) -> None:
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        samples = self.latencies_ms.setdefault(endpoint, deque(maxlen=LATENCY_SAMPLES))
+        samples.append(seconds * 1000.0)
+
+    def record_batch(self, n_requests: int, n_rows: int) -> None:
+        self.batches += 1
+        self.batched_requests += n_requests
+        self.batched_rows += n_rows
+        self.max_batch_requests = max(self.max_batch_requests, n_requests)
+
+    def snapshot(self) -> Dict[str, Any]:
+        uptime = max(time.time() - self.started_at, 1e-9)
+        latency = {}
+        for endpoint, samples in self.latencies_ms.items():
+            arr = np.fromiter(samples, dtype=float)
+            p50, p95, p99 = np.percentile(arr, [50, 95, 99]) if len(arr) else (0.0, 0.0, 0.0)
+            latency[endpoint] = {"p50_ms": round(p50, 3), "p95_ms": round(p95, 3), "p99_ms": round(p99, 3)}
+        total = sum(self.requests.values())
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests_total": total,
+            "requests_per_s": round(total / uptime, 3),
+            "requests": dict(self.requests),
+            "statuses": {str(k): v for k, v in self.statuses.items()},
+            "batches": self.batches,
+            "avg_batch_requests": round(self.batched_requests / self.batches, 3) if self.batches else 0.0,
+            "max_batch_requests": self.max_batch_requests,
+            "batched_rows": self.batched_rows,
+            "latency": latency,
+        }
+
+
+class ScoringBatcher:
+    """
+    Micro-batches concurrent score requests: the first request opens a
+    window of `window_ms`; everything that arrives before it closes (up to
+    `max_batch_rows`) is scored in one vectorized call per context school.
+
+    Each request's students get their own integer codes, so two requests
+    that reuse a student_id never mix rows.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+        metrics: Optional[ServiceMetrics] = None,
+    ):
+        self.config = dict(config or {})
+        self.window_s = window_ms / 1000.0
+        self.max_batch_rows = max_batch_rows
+        self.metrics = metrics or ServiceMetrics()
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def score(self, rows: Mapping[str, Any], school=None) -> np.ndarray:
+        """
+        Summary records (see summary_dtype) for the students in `rows` (a
+        DataFrame or a dict of column -> values), scored against `school`
+        (a school_context dict or None).
+        """
+        missing = [c for c in REQUIRED_COLS if c not in rows]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        codes, uniques = pd.factorize(np.asarray(rows["student_id"]), sort=True)
+        keep = codes >= 0  # rows without a student_id are dropped, as in score_students
+        pending = _Pending(
+            codes=codes[keep].astype(np.int64),
+            uniques=np.asarray(uniques),
+            week=week_dates_ns(rows["week_date"])[keep],
+            metrics={col: np.asarray(rows[col], dtype=float)[keep] for col in SIGNAL_COLS},
+            school=school,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        await self._queue.put(pending)
+        return await pending.future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = len(batch[0].codes)
+            deadline = loop.time() + self.window_s
+            while rows < self.max_batch_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item.codes)
+
+            self.metrics.record_batch(len(batch), rows)
+            try:
+                results = await loop.run_in_executor(None, self._score_batch, batch)
+            except Exception as exc:  # fail every request in the batch, keep serving
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                continue
+            for item, records in zip(batch, results):
+                if not item.future.done():
+                    item.future.set_result(records)
+
+    def _score_batch(self, batch: List[_Pending]) -> List[np.ndarray]:
+        results: List[Optional[np.ndarray]] = [None] * len(batch)
+
+        by_school: Dict[int, List[int]] = {}
+        for i, item in enumerate(batch):
+            by_school.setdefault(id(item.school), []).append(i)
+
+        for members in by_school.values():
+            ctx = batch[members[0]].school
+            cfg = _merge_config({**self.config, "school_context": ctx})
+            anchors = _anchors_from_school_context(ctx)
+
+            # Offset each request's codes so students stay separate.
+            offsets = np.cumsum([0] + [len(batch[i].uniques) for i in members])
+            payload = {
+                "code": np.concatenate([batch[i].codes + off for i, off in zip(members, offsets)]),
+                "week": np.concatenate([batch[i].week for i in members]).view("i8"),
+            }
+            for col in SIGNAL_COLS:
+                payload[col] = np.concatenate([batch[i].metrics[col] for i in members])
+
+            keys, n_weeks, latest, signals = _score_shard(payload, cfg["decay_rate"], anchors)
+            # float64 records: responses show the same values score_students gives.
+            records = _summary_records(
+                keys, n_weeks, latest.view("datetime64[ns]"), signals, cfg, _context_multiplier(ctx),
+                float_dtype=np.float64,
+            )
+
+            bounds = np.searchsorted(keys, offsets)
+            for j, i in enumerate(members):
+                part = records[bounds[j]:bounds[j + 1]]
+                ids = batch[i].uniques[part["student_id"] - offsets[j]]
+                results[i] = _with_ids(part, ids)
+        return results
+
+
+def _with_ids(records: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Swap the batch-local integer keys back to the request's student_ids."""
+    id_dtype = ids.dtype if ids.dtype.kind in "iu" else object
+    out = np.empty(len(records), dtype=[(name, id_dtype if name == "student_id" else records.dtype[name])
+                                        for name in records.dtype.names])
+    for name in records.dtype.names:
+        out[name] = ids if name == "student_id" else records[name]
+    return out
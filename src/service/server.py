@@ -0,0 +1,240 @@
+"""
+Local HTTP scoring service (asyncio, standard library only).
+
+    POST /score    {"rows": [...weekly rows...], "school_id": 1006}
+    POST /report   {"rows": [...one student's rows...], "school_id": 1006, "top_k": 5}
+    GET  /metrics  request, batch and latency counters
+    GET  /health
+
+Concurrent /score and /report requests share one vectorized scoring call
+per micro-batch window (see ScoringBatcher). The school registry and config
+are loaded once, at startup. Only the scoring columns of each row are
+read; anything else is ignored and listed back as ignored_columns.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.explainability.explanations import generate_explanation_report
+from src.scoring.risk_score import REQUIRED_COLS, SIGNAL_COLS, summary_context
+from src.scoring.school_context import SCHOOLS_PATH, get_school_registry
+from src.service.batcher import DEFAULT_MAX_BATCH_ROWS, DEFAULT_WINDOW_MS, ScoringBatcher, ServiceMetrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 16 * 2**20
+# /metrics keys: these paths, and "other" for anything else (so scans can't grow it).
+ENDPOINTS = ("/health", "/metrics", "/score", "/report")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    if isinstance(value, pd.Timestamp):
+        return None if pd.isna(value) else value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _records_to_dicts(records: np.ndarray) -> list:
+    names = records.dtype.names
+    dates = np.datetime_as_string(records["latest_week_date"], unit="D").tolist()
+    out = []
+    for row, date in zip(records.tolist(), dates):
+        item = dict(zip(names, row))
+        item["latest_week_date"] = None if date == "NaT" else date
+        out.append(item)
+    return out
+
+
+class ScoringService:
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        schools_path: str = SCHOOLS_PATH,
+        default_school=None,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+    ):
+        self.config = dict(config or {})
+        self.registry = get_school_registry(schools_path)
+        self.default_school = None if default_school is None else self.registry.lookup(default_school)
+        self.metrics = ServiceMetrics()
+        self._window_ms = window_ms
+        self._max_batch_rows = max_batch_rows
+        self.batcher: Optional[ScoringBatcher] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        self.batcher = ScoringBatcher(self.config, self._window_ms, self._max_batch_rows, self.metrics)
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.batcher is not None:
+            await self.batcher.stop()
+
+    # --- HTTP plumbing ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                path = path.split("?", 1)[0]
+                t0 = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                endpoint = path if path in ENDPOINTS else "other"
+                self.metrics.record_request(endpoint, status, time.perf_counter() - t0)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool) -> None:
+        body = json.dumps(payload, default=_json_default).encode()
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/metrics"): self._metrics,
+            ("POST", "/score"): self._score,
+            ("POST", "/report"): self._report,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            return (405 if path in ENDPOINTS else 404), {"error": f"{method} {path} not supported"}
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise _HTTPError(400, "request body must be a JSON object")
+            return 200, await handler(request)
+        except _HTTPError as e:
+            return e.status, {"error": str(e)}
+        except (ValueError, KeyError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:  # keep serving; report the failure to this caller only
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    # --- endpoints ---
+
+    def _school_for(self, request: Dict[str, Any]):
+        if request.get("school_id") is not None:
+            return self.registry.get(request["school_id"])
+        return self.default_school
+
+    @staticmethod
+    def _rows(request: Dict[str, Any]) -> Tuple[Dict[str, list], list]:
+        """Required columns of the posted rows as lists (no DataFrame per request)."""
+        rows = request.get("rows")
+        if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+            raise _HTTPError(400, "rows must be a non-empty list of weekly records")
+        seen = set().union(*rows)
+        missing = [c for c in REQUIRED_COLS if c not in seen]
+        if missing:
+            raise _HTTPError(400, f"Missing required columns: {missing}")
+        columns = {c: [r.get(c) for r in rows] for c in REQUIRED_COLS}
+        for c in SIGNAL_COLS:
+            # null -> NaN, as a missing value in a loaded CSV; anything non-numeric is a 400.
+            try:
+                columns[c] = np.array([np.nan if v is None else v for v in columns[c]], dtype=float)
+            except (TypeError, ValueError):
+                raise _HTTPError(400, f"{c} values must be numbers or null") from None
+        return columns, sorted(seen.difference(REQUIRED_COLS))
+
+    async def _health(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "ok", "schools": len(self.registry)}
+
+    async def _metrics(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self.metrics.snapshot()
+
+    async def _score(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        columns, ignored = self._rows(request)
+        school = self._school_for(request)
+        records = await self.batcher.score(columns, school)
+        return {
+            "students": _records_to_dicts(records),
+            "context": summary_context({**self.config, "school_context": school}),
+            "ignored_columns": ignored,
+        }
+
+    async def _report(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        columns, ignored = self._rows(request)
+        school = self._school_for(request)
+        if school is None:
+            raise _HTTPError(400, "school_id is required for a report (no default school configured)")
+        if len(set(columns["student_id"])) != 1:
+            raise _HTTPError(400, "a report request must contain exactly one student's rows")
+
+        records = await self.batcher.score(columns, school)
+        df = pd.DataFrame(columns)
+        summary = _records_to_dicts(records)[0]
+        report = await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: generate_explanation_report(
+                df, self.registry, school["school_id"],
+                summary["support_signal"], summary["review"], int(request.get("top_k", 5)),
+            ),
+        )
+        return {"student_id": summary["student_id"], "summary": summary, "report": report,
+                "ignored_columns": ignored}
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **kwargs) -> None:
+    """Run a ScoringService until cancelled."""
+    service = ScoringService(**kwargs)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
@@ -0,0 +1,296 @@
+"""
+Watch-folder ingestion: weekly SIS exports dropped into a directory are
+validated, deduplicated, appended to the columnar student store, and only
+the students they touch are rescored.
+
+    drop_dir/             new *.csv files land here
+    drop_dir/processed/   files moved here once ingested
+    drop_dir/rejected/    files that failed validation (with a .json note)
+    output_dir/scores-000001.csv ...  one part per rescore (touched students only)
+    output_dir/_state.npz             IncrementalScorer snapshot
+    output_dir/_watch.json            sequence number and pending dirty set
+
+Each poll picks up files whose size and mtime have not changed since the
+previous poll (so half-copied files are left alone), ingests them in name
+order and then rescores the dirty set once. New weeks are folded into the
+running IncrementalScorer state, so the cost follows the size of the
+weekly change; students with backfilled weeks are rebuilt from their own
+history in the store (a pushdown read), never the whole district's.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from src.atomic_io import OUTPUT_FORMATS, write_frame_atomic, write_json_atomic
+from src.scoring.incremental import IncrementalScorer
+from src.scoring.risk_score import REQUIRED_COLS, SIGNAL_COLS
+from src.student_data.schema import week_dates_ns
+from src.student_data.store import _require_pyarrow, read_student_store, write_student_store
+from src.student_data.validators import remove_blocked_columns
+
+STATE_FILE = "_state.npz"
+MANIFEST_FILE = "_watch.json"
+PROCESSED_DIR = "processed"
+REJECTED_DIR = "rejected"
+DEFAULT_POLL_SECONDS = 5.0
+
+
+@dataclass
+class IngestResult:
+    """What one dropped file contributed."""
+    path: str
+    rows_read: int = 0
+    rows_added: int = 0
+    duplicates: int = 0
+    invalid_rows: int = 0
+    students: int = 0
+    removed_columns: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _clean_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Required columns with fixed dtypes (int64 id, datetime week, float64
+    metrics), so every appended store file shares one schema. Rows without
+    a usable student_id or week_date are dropped.
+    """
+    ids = pd.to_numeric(df["student_id"], errors="coerce")
+    out = pd.DataFrame({
+        "student_id": ids,
+        "week_date": week_dates_ns(df["week_date"]),
+    })
+    for col in SIGNAL_COLS:
+        out[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
+    keep = out["student_id"].notna() & out["week_date"].notna() & (out["student_id"] % 1 == 0)
+    out = out[keep]
+    out["student_id"] = out["student_id"].astype(np.int64)
+    return out.reset_index(drop=True)
+
+
+def _row_keys(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays([
+        df["student_id"].to_numpy(np.int64),
+        df["week_date"].to_numpy("datetime64[ns]").view("i8"),
+    ])
+
+
+class IngestionDaemon:
+    """
+    Polls `drop_dir` and keeps `store_root` and the score output in step
+    with it. Construct once, then call poll() on a timer or run() to loop.
+
+    The dirty set is written to the manifest before rows reach the store,
+    so after a crash the next start rebuilds those students from the store
+    and re-ingesting the same file finds its rows already stored.
+    """
+
+    def __init__(
+        self,
+        drop_dir: str,
+        store_root: str,
+        output_dir: str,
+        config: Optional[Dict[str, Any]] = None,
+        fmt: str = "csv",
+    ):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(OUTPUT_FORMATS)}")
+        _require_pyarrow()
+
+        self.drop_dir = drop_dir
+        self.store_root = store_root
+        self.output_dir = output_dir
+        self.fmt = fmt
+        for d in (drop_dir, os.path.join(drop_dir, PROCESSED_DIR), os.path.join(drop_dir, REJECTED_DIR), output_dir):
+            os.makedirs(d, exist_ok=True)
+
+        self._state_path = os.path.join(output_dir, STATE_FILE)
+        self._manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+        self._seen: Dict[str, tuple] = {}
+        self._pending: List[pd.DataFrame] = []
+        self._pending_keys = pd.MultiIndex.from_arrays([np.array([], np.int64), np.array([], np.int64)])
+
+        manifest = {"seq": 0, "dirty": []}
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        self.seq = int(manifest.get("seq", 0))
+        self.dirty: Set[int] = {int(s) for s in manifest.get("dirty", [])}
+
+        if os.path.exists(self._state_path):
+            self.scorer = IncrementalScorer.load(self._state_path, config)
+        else:
+            self.scorer = IncrementalScorer.from_history(self._history(), config)
+            self.scorer.save(self._state_path)
+
+        if self.dirty:
+            # Interrupted between storing rows and rescoring: rebuild those
+            # students from what actually reached the store.
+            self.scorer.replace(self._history(sorted(self.dirty)))
+            self._flush_scores(sorted(self.dirty))
+
+    # --- store access ---
+
+    def _history(self, student_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        if not os.path.exists(self.store_root):
+            return pd.DataFrame({c: pd.Series(dtype=float) for c in REQUIRED_COLS})
+        return read_student_store(self.store_root, columns=REQUIRED_COLS, student_ids=student_ids)
+
+    def _save_manifest(self) -> None:
+        write_json_atomic({"seq": self.seq, "dirty": sorted(self.dirty)}, self._manifest_path)
+
+    # --- one file ---
+
+    def _ready_files(self) -> List[str]:
+        """*.csv files whose size and mtime held still since the last poll."""
+        ready = []
+        current = {}
+        for name in sorted(os.listdir(self.drop_dir)):
+            path = os.path.join(self.drop_dir, name)
+            if not name.endswith(".csv") or name.startswith(".") or not os.path.isfile(path):
+                continue
+            st = os.stat(path)
+            current[name] = (st.st_size, st.st_mtime_ns)
+            if self._seen.get(name) == current[name]:
+                ready.append(name)
+        self._seen = current
+        return ready
+
+    def _dedup(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop rows whose (student_id, week_date) is already stored or pending.
+        Only weeks at or before a student's latest scored week can collide
+        with the store, so only those students' keys are read back.
+        """
+        rows = rows.drop_duplicates(["student_id", "week_date"], keep="last")
+        keys = _row_keys(rows)
+        seen = keys.isin(self._pending_keys)
+
+        last = self.scorer._last_week_of(rows["student_id"].to_numpy(np.int64))
+        week = rows["week_date"].to_numpy("datetime64[ns]")
+        maybe_stored = ~np.isnat(last) & (week <= last) & ~seen
+        if maybe_stored.any():
+            candidates = np.unique(rows["student_id"].to_numpy(np.int64)[maybe_stored])
+            stored = self._history(candidates.tolist())
+            if len(stored):
+                stored = _clean_rows(stored)
+                seen |= keys.isin(_row_keys(stored))
+        return rows[~seen]
+
+    def _reject(self, name: str, result: IngestResult) -> None:
+        shutil.move(os.path.join(self.drop_dir, name), os.path.join(self.drop_dir, REJECTED_DIR, name))
+        write_json_atomic(
+            {"file": name, "error": result.error, "removed_columns": result.removed_columns},
+            os.path.join(self.drop_dir, REJECTED_DIR, name + ".json"),
+        )
+
+    def ingest_file(self, name: str) -> IngestResult:
+        """Validate, dedup and store one dropped file; its students join the dirty set."""
+        result = IngestResult(path=os.path.join(self.drop_dir, name))
+        try:
+            raw = pd.read_csv(result.path)
+        except (ValueError, pd.errors.ParserError, UnicodeDecodeError) as e:
+            result.error = f"unreadable CSV: {e}"
+            self._reject(name, result)
+            return result
+
+        cleaned, guard = remove_blocked_columns(raw)
+        result.rows_read = len(raw)
+        result.removed_columns = list(dict.fromkeys(
+            guard.blocked_columns + guard.pii_columns + list(guard.pii_value_columns)
+        ))
+        if guard.missing_required:
+            result.error = f"missing required columns: {guard.missing_required}"
+            self._reject(name, result)
+            return result
+
+        rows = _clean_rows(cleaned)
+        result.invalid_rows = len(raw) - len(rows)
+        new_rows = self._dedup(rows)
+        result.duplicates = len(rows) - len(new_rows)
+        result.rows_added = len(new_rows)
+
+        if len(new_rows):
+            ids = np.unique(new_rows["student_id"].to_numpy(np.int64))
+            result.students = len(ids)
+            self.dirty.update(ids.tolist())
+            self._save_manifest()
+            write_student_store(new_rows, self.store_root, append=True)
+            self._pending.append(new_rows)
+            self._pending_keys = self._pending_keys.append(_row_keys(new_rows))
+
+        shutil.move(result.path, os.path.join(self.drop_dir, PROCESSED_DIR, name))
+        return result
+
+    # --- rescoring ---
+
+    def _flush_scores(self, student_ids: List[int]) -> Optional[str]:
+        summary = self.scorer.summary(np.asarray(student_ids, dtype=np.int64))
+        self.seq += 1
+        part = os.path.join(self.output_dir, f"scores-{self.seq:06d}{OUTPUT_FORMATS[self.fmt]}")
+        write_frame_atomic(summary, part, self.fmt)
+        self.scorer.save(self._state_path)
+        self.dirty.clear()
+        self._save_manifest()
+        return part
+
+    def rescore(self) -> Optional[str]:
+        """
+        Rescore the dirty set and write its summaries as the next scores
+        part. Returns the part path (None when nothing was dirty).
+        """
+        if not self.dirty:
+            return None
+        rows = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        self._pending_keys = self._pending_keys[:0]
+
+        # Students whose new rows all come after their scored weeks are
+        # appended in O(new rows); any backfill means a rebuild from that
+        # student's own stored history.
+        ids = rows["student_id"].to_numpy(np.int64)
+        week = rows["week_date"].to_numpy("datetime64[ns]")
+        last = self.scorer._last_week_of(ids)
+        backfill = np.unique(ids[~np.isnat(last) & (week <= last)])
+        appended = ~np.isin(ids, backfill)
+
+        if appended.any():
+            self.scorer.update(rows[appended])
+        if len(backfill):
+            self.scorer.replace(self._history(backfill.tolist()))
+        return self._flush_scores(sorted(self.dirty))
+
+    def poll(self) -> Dict[str, Any]:
+        """Ingest every ready file, then rescore once. Returns a summary of the cycle."""
+        results = [self.ingest_file(name) for name in self._ready_files()]
+        n_dirty = len(self.dirty)
+        part = self.rescore()
+        return {
+            "files": results,
+            "rows_added": sum(r.rows_added for r in results),
+            "rescored_students": n_dirty if part else 0,
+            "scores_part": part,
+        }
+
+    def run(
+        self,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        on_cycle: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_cycles: Optional[int] = None,
+    ) -> None:
+        """Poll until interrupted (or for `max_cycles` polls)."""
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            cycle = self.poll()
+            if on_cycle is not None and cycle["files"]:
+                on_cycle(cycle)
+            cycles += 1
+            if max_cycles is None or cycles < max_cycles:
+                time.sleep(poll_seconds)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, Hashable
+
+import numpy as np
+import pandas as pd
+
+from src.student_data.schema import STUDENT_SCHEMA, apply_student_schema
+from src.student_data.store import PARTITION_COL, _require_pyarrow
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # optional: only needed for the columnar store
+    pa = None
+    ds = None
+
+SORT_BATCH_ROWS = 64_000
+
+
+class StudentIndex:
+    """
+    Rows sorted by (student_id, week_date) in a memory-mapped Arrow file,
+    plus CSR-style offsets, built once at upload. timeseries(student_id) is
+    then a dict lookup and a zero-copy slice of the mapped table: no scan
+    over all rows, and only that student's pages are touched.
+
+    Only the ids and offsets live in Python memory; the rows stay on disk.
+    Rows without a student_id are left out.
+    """
+
+    def __init__(self, path: str):
+        _require_pyarrow()
+        self.path = path
+        self.table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+        ids = self.table.column("student_id").to_pandas().to_numpy()
+        if len(ids):
+            boundary = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+            starts = np.concatenate(([0], boundary))
+        else:
+            starts = np.array([], dtype=np.int64)
+
+        self.student_ids = ids[starts]
+        self.offsets = np.append(starts, len(ids))
+        self._position: Dict[Hashable, int] = {sid: i for i, sid in enumerate(self.student_ids.tolist())}
+
+    @classmethod
+    def build(cls, store_root: str, path: str, batch_rows: int = SORT_BATCH_ROWS) -> "StudentIndex":
+        """
+        Write the store's rows to `path` sorted by (student_id, week_date)
+        and open the index over it. Only the two key columns are held in
+        memory; rows are copied out in `batch_rows` blocks, through an
+        unsorted memory-mapped copy of the store.
+        """
+        _require_pyarrow()
+        dataset = ds.dataset(store_root, format="parquet", partitioning="hive")
+        columns = [f.name for f in dataset.schema if f.name != PARTITION_COL]
+
+        unsorted = path + ".unsorted"
+        schema = dataset.schema
+        schema = pa.schema([schema.field(c) for c in columns])
+        with pa.ipc.new_file(unsorted, schema) as writer:
+            for batch in dataset.to_batches(columns=columns):
+                writer.write_batch(batch)
+        try:
+            rows = pa.ipc.open_file(pa.memory_map(unsorted)).read_all()
+            keys = rows.select(["student_id", "week_date"]).to_pandas()
+            keys = keys[keys["student_id"].notna()]
+            order = keys.sort_values(["student_id", "week_date"], kind="stable").index.to_numpy()
+            with pa.ipc.new_file(path, schema) as writer:
+                for lo in range(0, len(order), batch_rows):
+                    writer.write_table(rows.take(order[lo:lo + batch_rows]))
+            del rows
+        finally:
+            os.remove(unsorted)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self.student_ids)
+
+    def __contains__(self, student_id) -> bool:
+        return student_id in self._position
+
+    def timeseries(self, student_id) -> pd.DataFrame:
+        """One student's rows, sorted by week_date, with the store's load schema."""
+        i = self._position.get(student_id)
+        if i is None:
+            raise KeyError(f"student_id {student_id} not in index")
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return apply_student_schema(self.table.slice(lo, hi - lo).to_pandas(), STUDENT_SCHEMA)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.student_data.store import write_student_store
+from src.student_data.validators import (
+    REQUIRED_STUDENT_COLUMNS,
+    GuardrailResult,
+    _guardrail_result,
+    find_pii_values,
+    _scannable,
+    validate_student_data,
+)
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Every chunk is appended as its own store file, so each column needs the
+# same type in every chunk or the store can't be read back (a count that is
+# blank in one chunk would be float there and int elsewhere; a text column
+# that is blank early would be inferred as float). Types are fixed up front:
+# metrics float64, week_date and any other column text, and student_id
+# chosen once for the whole file by the first pass (see _id_dtype).
+METRIC_COLUMNS = ["grades", "tardies", "absences", "discipline_events", "truancy_days"]
+
+# student_id types from narrowest to widest; the first pass widens as needed.
+_ID_DTYPES = ["Int64", "float64", "string"]
+
+
+def _column_dtypes(usecols: List[str], id_dtype: str) -> Dict[str, str]:
+    dtypes = {c: "float64" if c in METRIC_COLUMNS else "string" for c in usecols}
+    dtypes["student_id"] = id_dtype
+    return dtypes
+
+
+def _id_dtype(ids: pd.Series, current: str = "Int64") -> str:
+    """The narrowest of _ID_DTYPES that holds these (text) ids and `current`."""
+    if current == "string":
+        return current
+    values = ids.dropna()
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.isna().any():
+        return "string"
+    if current == "Int64" and (numbers == numbers.round()).all():
+        return "Int64"
+    return "float64"
+
+
+def _inferred(values: pd.Series) -> pd.Series:
+    """Text values as read_csv would type them: numeric when every value parses as a number."""
+    numbers = pd.to_numeric(values, errors="coerce")
+    return numbers if numbers.count() == values.count() else values
+
+
+def _rewind(source) -> None:
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def _read_header(source) -> pd.DataFrame:
+    header = pd.read_csv(source, nrows=0)
+    _rewind(source)
+    return header
+
+
+def ingest_csv(
+    source,
+    store_root: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    append: bool = False,
+    on_chunk: Optional[Callable[[pd.DataFrame, int], None]] = None,
+) -> GuardrailResult:
+    """
+    Stream a student CSV (path or file object) into the columnar store with
+    bounded memory.
+
+    Guardrails are decided once from the header: protected and PII columns
+    are left out of `usecols`, so they are never parsed at all. The file is
+    then read `chunk_rows` rows at a time and each cleaned chunk is appended
+    to the store. Nothing is written when required columns are missing.
+
+    A first pass over the file, before anything is written, reads only
+    student_id and the remaining non-required columns. It picks one
+    student_id type for the whole file (nullable Int64 when every id is a
+    whole number, float64 for other numbers, otherwise text) and scans
+    cell values for PII in the columns that are text over the whole file.
+    A column whose values look like PII is then left out of `usecols` too,
+    so no part of the store ever holds it. With the
+    types fixed for every column (see _column_dtypes), each chunk's file
+    shares one schema. File objects must be seekable for the second pass.
+
+    on_chunk(chunk, rows_so_far) is called after each chunk is written.
+    Returns the same GuardrailResult remove_blocked_columns would.
+    """
+    header = _read_header(source)
+    result = validate_student_data(header, scan_values=False)
+    if result.missing_required:
+        return result
+
+    cols_to_drop = set(result.blocked_columns + result.pii_columns)
+    usecols = [c for c in header.columns if c not in cols_to_drop]
+    scan_cols = [c for c in usecols if c not in REQUIRED_STUDENT_COLUMNS]
+
+    # Only columns that are text over the whole file are value-scanned, as
+    # in remove_blocked_columns (see validators._scannable); a column stays
+    # unscannable while every chunk so far is numeric.
+    value_hits: Dict[str, List[str]] = {}
+    unscannable = set(scan_cols)
+    id_dtype = _ID_DTYPES[0]
+    with pd.read_csv(source, usecols=["student_id"] + scan_cols, dtype="string", chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            id_dtype = _id_dtype(chunk["student_id"], id_dtype)
+            unscannable = {c for c in unscannable if not _scannable(_inferred(chunk[c]))}
+            pending = [c for c in scan_cols if c not in value_hits]
+            if pending:
+                value_hits.update(find_pii_values(chunk, pending))
+            elif id_dtype == _ID_DTYPES[-1] and not unscannable:
+                break
+    _rewind(source)
+    value_hits = {c: kinds for c, kinds in value_hits.items() if c not in unscannable}
+    usecols = [c for c in usecols if c not in value_hits]
+
+    rows = 0
+    dtype = _column_dtypes(usecols, id_dtype)
+    for i, chunk in enumerate(pd.read_csv(source, usecols=usecols, dtype=dtype, chunksize=chunk_rows)):
+        write_student_store(chunk, store_root, append=append or i > 0)
+        rows += len(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk, rows)
+
+    return _guardrail_result(
+        result.blocked_columns, result.pii_columns, result.missing_required, value_hits
+    )
@@ -1,5 +1,60 @@
 import pandas as pd
 
-def load_student_data(path="data/student_sample.csv"):
-    df = pd.read_csv(path)
-    return df
\ No newline at end of file
+from src.student_data.schema import STUDENT_SCHEMA, apply_student_schema, parse_week_dates
+from src.student_data.store import is_student_store, read_student_store
+
+
+def load_student_data(
+    path="data/student_sample.csv",
+    columns=None,
+    student_ids=None,
+    start_date=None,
+    end_date=None,
+    schema=STUDENT_SCHEMA,
+):
+    """
+    Load weekly student rows from a CSV (path or uploaded file object) or a
+    columnar store written by write_student_store.
+
+    For a store, column projection and the student_id / week_date filters
+    are pushed down so only the needed bytes are read. For CSV the same
+    arguments are applied after parsing.
+
+    Known columns are narrowed to `schema` (int32 ids, float64 grades,
+    int16 counts where the values fit) and week_date is parsed to datetime
+    once, here; pass schema=None for pandas' default dtypes and raw dates.
+    """
+    if is_student_store(path):
+        df = read_student_store(
+            path,
+            columns=columns,
+            student_ids=student_ids,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        return df if schema is None else apply_student_schema(df, schema)
+
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(
+            list(columns)
+            + (["student_id"] if student_ids is not None else [])
+            + (["week_date"] if start_date is not None or end_date is not None else [])
+        ))
+    df = pd.read_csv(path, usecols=usecols)
+    if schema is not None:
+        df = apply_student_schema(df, schema)
+
+    mask = pd.Series(True, index=df.index)
+    if student_ids is not None:
+        mask &= df["student_id"].isin(list(student_ids))
+    if start_date is not None or end_date is not None:
+        week = parse_week_dates(df["week_date"])
+        if start_date is not None:
+            mask &= week >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= week <= pd.Timestamp(end_date)
+    if not mask.all():
+        df = df[mask]
+
+    return df[list(columns)] if columns is not None else df
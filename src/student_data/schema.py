@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Target dtypes for weekly student rows. Counts and ids are only narrowed
+# when every value fits (no missing values, whole numbers, in range);
+# otherwise they stay float64 / as read, so NaN handling downstream is
+# unchanged. Grades stay float64: they are shown in reports as read, and
+# float32 would print 72.6 as 72.5999984741211.
+STUDENT_SCHEMA: Dict[str, str] = {
+    "student_id": "int32",
+    "grades": "float64",
+    "tardies": "int16",
+    "absences": "int16",
+    "discipline_events": "int16",
+    "truancy_days": "int16",
+}
+
+# Fixed format for the fast date path; other spellings fall back to the
+# general parser.
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_week_dates(values, errors: str = "coerce") -> pd.Series:
+    """
+    week_date as datetime64. Already-parsed input is returned as is, so
+    callers can use this unconditionally without paying for a second parse.
+
+    Weekly data repeats a handful of dates across every student, so only
+    the distinct strings are parsed and the result is mapped back by code.
+    """
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques)
+    parsed = pd.to_datetime(uniques, format=DATE_FORMAT, errors="coerce").astype("datetime64[ns]")
+    retry = parsed.isna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(uniques[retry], errors=errors, format="mixed")
+
+    out = parsed.to_numpy()[codes]
+    out[codes < 0] = np.datetime64("NaT")
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+def week_dates_ns(values) -> np.ndarray:
+    """week_date as a datetime64[ns] array (NaT for unparseable dates)."""
+    if isinstance(values, (list, tuple)):
+        # Small lists of ISO strings (e.g. one API request): NumPy's own
+        # parser, skipping the pandas machinery; anything else falls through.
+        try:
+            return np.array(values, dtype="datetime64[ns]")
+        except (ValueError, TypeError):
+            pass
+    return parse_week_dates(values).to_numpy(dtype="datetime64[ns]")
+
+
+def _narrow_int(col: pd.Series, dtype: str) -> Optional[pd.Series]:
+    if not pd.api.types.is_numeric_dtype(col.dtype) or pd.api.types.is_bool_dtype(col.dtype):
+        return None
+    values = col.to_numpy()
+    if col.isna().any():
+        return None
+    info = np.iinfo(dtype)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        return None
+    if values.dtype.kind == "f" and not np.array_equal(values, np.round(values)):
+        return None
+    return col.astype(dtype)
+
+
+def apply_student_schema(df: pd.DataFrame, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Narrow known columns to `schema` (default STUDENT_SCHEMA) and parse
+    week_date once. Columns that don't fit their target type are left
+    as float64 (counts) or unchanged (ids, non-numeric values).
+    """
+    schema = STUDENT_SCHEMA if schema is None else schema
+    out = {}
+    for name, dtype in schema.items():
+        if name not in df.columns:
+            continue
+        col = df[name]
+        if np.dtype(dtype).kind in "iu":
+            narrowed = _narrow_int(col, dtype)
+            if narrowed is not None:
+                out[name] = narrowed
+            elif name != "student_id" and pd.api.types.is_numeric_dtype(col.dtype):
+                out[name] = col.astype("float64")
+        elif pd.api.types.is_numeric_dtype(col.dtype):
+            out[name] = col.astype(dtype)
+    if "week_date" in df.columns:
+        out["week_date"] = parse_week_dates(df["week_date"])
+
+    if not out:
+        return df
+    df = df.copy(deep=False)
+    for name, col in out.items():
+        df[name] = col
+    return df
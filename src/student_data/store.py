@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import shutil
+import uuid
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from src.student_data.schema import parse_week_dates
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for the columnar store
+    pa = None
+    pq = None
+
+# Weekly rows are partitioned by calendar quarter ("2026Q1") so a date-range
+# read can skip whole directories; inside each file rows are sorted by
+# (student_id, week_date) so row-group statistics prune by student too.
+PARTITION_COL = "term"
+ROW_GROUP_SIZE = 64_000
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("The columnar student store needs pyarrow (pip install pyarrow).")
+
+
+def is_student_store(path) -> bool:
+    """True for a store directory or a single .parquet file."""
+    if not isinstance(path, (str, os.PathLike)):
+        return False
+    path = os.fspath(path)
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def _term(week: pd.Series) -> pd.Series:
+    return week.dt.year.astype("Int64").astype(str) + "Q" + week.dt.quarter.astype("Int64").astype(str)
+
+
+def write_student_store(df: pd.DataFrame, root: str, append: bool = False) -> None:
+    """
+    Write weekly student rows to a Parquet dataset partitioned by term.
+
+    append=False replaces any existing store at `root`; append=True adds new
+    files next to the existing ones (used by chunked ingestion).
+    """
+    _require_pyarrow()
+
+    out = df.copy()
+    out["week_date"] = parse_week_dates(out["week_date"])
+    out[PARTITION_COL] = _term(out["week_date"]).where(out["week_date"].notna(), None)
+    out = out.sort_values(["student_id", "week_date"], kind="stable")
+
+    if not append and os.path.exists(root):
+        shutil.rmtree(root)
+
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root,
+        partition_cols=[PARTITION_COL],
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=ROW_GROUP_SIZE,
+    )
+
+
+def _filters(
+    student_ids: Optional[Iterable] = None,
+    start_date=None,
+    end_date=None,
+    partitioned: bool = True,
+) -> Optional[List[tuple]]:
+    filters: List[tuple] = []
+    if student_ids is not None:
+        filters.append(("student_id", "in", list(student_ids)))
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        filters.append(("week_date", ">=", start))
+        if partitioned:
+            filters.append((PARTITION_COL, ">=", f"{start.year}Q{start.quarter}"))
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        filters.append(("week_date", "<=", end))
+        if partitioned:
+            filters.append((PARTITION_COL, "<=", f"{end.year}Q{end.quarter}"))
+    return filters or None
+
+
+def read_student_store(
+    root: str,
+    columns: Optional[List[str]] = None,
+    student_ids: Optional[Iterable] = None,
+    start_date=None,
+    end_date=None,
+) -> pd.DataFrame:
+    """
+    Read from the columnar store, touching only what is asked for:
+      - columns: project to these columns
+      - student_ids / start_date / end_date: pushed down to partition and
+        row-group pruning before any data is decoded
+    Files are memory-mapped rather than read into Python buffers.
+    """
+    _require_pyarrow()
+
+    partitioned = os.path.isdir(root)
+    table = pq.read_table(
+        root,
+        columns=columns,
+        filters=_filters(student_ids, start_date, end_date, partitioned),
+        memory_map=True,
+    )
+    df = table.to_pandas()
+    if PARTITION_COL in df.columns and (columns is None or PARTITION_COL not in columns):
+        df = df.drop(columns=[PARTITION_COL])
+    if {"student_id", "week_date"}.issubset(df.columns):
+        df = df.sort_values(["student_id", "week_date"], kind="stable", ignore_index=True)
+    return df
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.student_data.index import StudentIndex
+from src.student_data.ingest import DEFAULT_CHUNK_ROWS, ingest_csv
+from src.student_data.loader import load_student_data
+from src.student_data.store import _require_pyarrow
+from src.student_data.validators import GuardrailResult
+
+PREVIEW_ROWS = 25
+
+
+class SpilledUpload:
+    """
+    Handle to an uploaded CSV that was cleaned and spilled to a temporary
+    columnar store, plus the per-student index over it. This is all a
+    session keeps; cohort reads go to the store with column / student
+    pushdown, single students to the index. The temporary directory is
+    removed by discard() or when the handle is garbage collected.
+    """
+
+    def __init__(self, root: str, rows: int, name: str = ""):
+        self.root = root
+        self.path = os.path.join(root, "store")
+        self.rows = rows
+        self.name = name
+        self.index = StudentIndex.build(self.path, os.path.join(root, "index.arrow"))
+        self._finalizer = weakref.finalize(self, shutil.rmtree, root, True)
+
+    def student_ids(self) -> np.ndarray:
+        """Sorted distinct student_ids, from the index."""
+        return self.index.student_ids
+
+    def load(self, columns: Optional[List[str]] = None, student_ids: Optional[Iterable] = None) -> pd.DataFrame:
+        """Rows as load_student_data returns them, sorted by (student_id, week_date)."""
+        return load_student_data(self.path, columns=columns, student_ids=student_ids)
+
+    def timeseries(self, student_id) -> pd.DataFrame:
+        """One student's rows, sorted by week_date: an offset slice of the index."""
+        return self.index.timeseries(student_id)
+
+    def discard(self) -> None:
+        self._finalizer()
+
+
+def spill_upload(
+    source,
+    name: str = "",
+    total_bytes: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    on_progress: Optional[Callable[[Optional[float], int], None]] = None,
+    preview_rows: int = PREVIEW_ROWS,
+) -> Tuple[Optional[SpilledUpload], GuardrailResult, Optional[pd.DataFrame]]:
+    """
+    Stream an uploaded CSV (file object or path) through ingest_csv into a
+    fresh temporary store.
+
+    on_progress(fraction, rows_so_far) is called after each chunk; fraction
+    is the share of `total_bytes` consumed (None when the source can't
+    tell). The preview is the first `preview_rows` cleaned rows of the first
+    chunk only. Returns (handle, guardrails, preview); handle is None when
+    required columns are missing, in which case nothing is kept on disk.
+    """
+    _require_pyarrow()
+    root = tempfile.mkdtemp(prefix="student_upload_")
+    state = {"rows": 0, "preview": None}
+
+    def on_chunk(chunk: pd.DataFrame, rows: int) -> None:
+        if state["preview"] is None:
+            state["preview"] = chunk.head(preview_rows).reset_index(drop=True)
+        state["rows"] = rows
+        if on_progress is not None:
+            fraction = None
+            if total_bytes and hasattr(source, "tell"):
+                fraction = min(source.tell() / total_bytes, 1.0)
+            on_progress(fraction, rows)
+
+    try:
+        guardrails = ingest_csv(source, os.path.join(root, "store"), chunk_rows, on_chunk=on_chunk)
+        if guardrails.missing_required or state["rows"] == 0:
+            shutil.rmtree(root, ignore_errors=True)
+            return None, guardrails, state["preview"]
+        handle = SpilledUpload(root, state["rows"], name)
+    except BaseException:
+        shutil.rmtree(root, ignore_errors=True)
+        raise
+    return handle, guardrails, state["preview"]
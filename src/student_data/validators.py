@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import re
 
+from src.profiling import stage
+
 # Explicit lists help judges see what you're blocking (on purpose).
 PROTECTED_TERMS = [
     # Race / ethnicity
@@ -44,6 +46,33 @@ REQUIRED_STUDENT_COLUMNS = [
     "tardies", "absences", "discipline_events", "truancy_days"
 ]
 
+# PII can also hide in cell values under a harmless header.
+PII_VALUE_PATTERNS = {
+    "email": r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}",
+    "phone": r"(?:\+?1[\s.\-]?)?\(?\b\d{3}\)?[\s.\-]?\d{3}[\s.\-]\d{4}\b",
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "street_address": (
+        r"\b\d{1,6}\s+(?:[A-Za-z0-9.']+\s+){0,4}"
+        r"(?:street|st|avenue|ave|road|rd|boulevard|blvd|lane|ln|drive|dr|court|ct|way|place|pl|terrace|ter)\b"
+    ),
+}
+
+VALUE_SCAN_SAMPLE_ROWS = 1000
+
+
+def _compile_terms(terms: List[str]) -> "re.Pattern[str]":
+    # Longest first so overlapping terms don't shadow each other; a search
+    # hit is equivalent to any(term in text for term in terms).
+    ordered = sorted(set(terms), key=len, reverse=True)
+    return re.compile("|".join(re.escape(t) for t in ordered))
+
+
+# Built once at import instead of looping over every term per column.
+_PROTECTED_RE = _compile_terms(PROTECTED_TERMS)
+_PII_RE = _compile_terms(PII_TERMS)
+_PII_VALUE_RES = {kind: re.compile(p, re.IGNORECASE) for kind, p in PII_VALUE_PATTERNS.items()}
+_ANY_PII_VALUE_RE = re.compile("|".join(f"(?:{p})" for p in PII_VALUE_PATTERNS.values()), re.IGNORECASE)
+
 
 @dataclass
 class GuardrailResult:
@@ -52,6 +81,8 @@ class GuardrailResult:
     pii_columns: List[str]
     missing_required: List[str]
     notes: List[str]
+    # column -> kinds of PII found in its values (see PII_VALUE_PATTERNS)
+    pii_value_columns: Dict[str, List[str]] = field(default_factory=dict)
 
 
 def _normalize(s: str) -> str:
@@ -68,9 +99,9 @@ def find_blocked_columns(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
     normalized_cols = {col: _normalize(col) for col in df.columns}
 
     for col, norm in normalized_cols.items():
-        if any(term in norm for term in PROTECTED_TERMS):
+        if _PROTECTED_RE.search(norm):
             protected_cols.append(col)
-        if any(term in norm for term in PII_TERMS):
+        if _PII_RE.search(norm):
             pii_cols.append(col)
 
     # De-duplicate while preserving order
@@ -86,29 +117,102 @@ def find_blocked_columns(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
     return dedupe(protected_cols), dedupe(pii_cols)
 
 
-def validate_student_data(df: pd.DataFrame) -> GuardrailResult:
-    blocked_cols, pii_cols = find_blocked_columns(df)
-    missing_required = [c for c in REQUIRED_STUDENT_COLUMNS if c not in df.columns]
+def _scannable(series: pd.Series) -> bool:
+    return not (
+        pd.api.types.is_numeric_dtype(series)
+        or pd.api.types.is_bool_dtype(series)
+        or pd.api.types.is_datetime64_any_dtype(series)
+    )
+
 
+def find_pii_values(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    sample_rows: int = VALUE_SCAN_SAMPLE_ROWS,
+) -> Dict[str, List[str]]:
+    """
+    Return {column: [pii kinds]} for text columns whose cell values look like
+    emails, phone numbers, SSNs or street addresses.
+
+    Each column is checked on its first `sample_rows` values, then in full
+    only if the sample was clean; the full pass uses one combined pattern
+    and only breaks hits down by kind when something matched.
+    """
+    hits: Dict[str, List[str]] = {}
+    candidates = columns if columns is not None else [
+        c for c in df.columns if c not in REQUIRED_STUDENT_COLUMNS
+    ]
+
+    for col in candidates:
+        series = df[col]
+        if not _scannable(series):
+            continue
+        values = series.dropna().astype(str)
+        if values.empty:
+            continue
+
+        sample = values.iloc[:sample_rows]
+        if not sample.str.contains(_ANY_PII_VALUE_RE).any():
+            if len(values) <= sample_rows or not values.str.contains(_ANY_PII_VALUE_RE).any():
+                continue
+            sample = values
+
+        kinds = [kind for kind, pat in _PII_VALUE_RES.items() if sample.str.contains(pat).any()]
+        if kinds:
+            hits[col] = kinds
+
+    return hits
+
+
+def _guardrail_result(
+    blocked_cols: List[str],
+    pii_cols: List[str],
+    missing_required: List[str],
+    pii_value_columns: Dict[str, List[str]],
+) -> GuardrailResult:
     notes: List[str] = []
     if blocked_cols:
         notes.append("Protected attributes detected (must not be used).")
     if pii_cols:
         notes.append("Potential PII fields detected (must not be used).")
+    if pii_value_columns:
+        notes.append("Potential PII values detected in column contents (must not be used).")
     if missing_required:
         notes.append("Missing required student columns.")
 
-    passed = (len(blocked_cols) == 0) and (len(pii_cols) == 0) and (len(missing_required) == 0)
+    passed = (
+        len(blocked_cols) == 0
+        and len(pii_cols) == 0
+        and len(pii_value_columns) == 0
+        and len(missing_required) == 0
+    )
 
     return GuardrailResult(
         passed=passed,
         blocked_columns=blocked_cols,
         pii_columns=pii_cols,
         missing_required=missing_required,
-        notes=notes
+        notes=notes,
+        pii_value_columns=pii_value_columns,
     )
 
 
+def validate_student_data(df: pd.DataFrame, scan_values: bool = True) -> GuardrailResult:
+    with stage("guardrails.header_match"):
+        blocked_cols, pii_cols = find_blocked_columns(df)
+        missing_required = [c for c in REQUIRED_STUDENT_COLUMNS if c not in df.columns]
+
+    pii_value_columns: Dict[str, List[str]] = {}
+    if scan_values:
+        with stage("guardrails.value_scan", rows=len(df)):
+            already_blocked = set(blocked_cols + pii_cols)
+            pii_value_columns = find_pii_values(
+                df, [c for c in df.columns if c not in already_blocked and c not in REQUIRED_STUDENT_COLUMNS]
+            )
+
+    return _guardrail_result(blocked_cols, pii_cols, missing_required, pii_value_columns)
+
+
 def remove_blocked_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, GuardrailResult]:
     """
     Returns:
@@ -116,10 +220,16 @@ def remove_blocked_columns(df: pd.DataFrame) -> Tuple[pd.DataFrame, GuardrailRes
       - GuardrailResult describing what was found/removed
     """
     result = validate_student_data(df)
-    cleaned = df.copy()
 
-    cols_to_drop = list(dict.fromkeys(result.blocked_columns + result.pii_columns))
-    if cols_to_drop:
-        cleaned = cleaned.drop(columns=cols_to_drop, errors="ignore")
+    cols_to_drop = list(dict.fromkeys(
+        result.blocked_columns + result.pii_columns + list(result.pii_value_columns)
+    ))
+    with stage("guardrails.drop_copy", rows=len(df)) as s:
+        if cols_to_drop:
+            # drop() already returns a new frame; no need to copy first
+            cleaned = df.drop(columns=cols_to_drop, errors="ignore")
+        else:
+            cleaned = df.copy()
+        s.add_bytes(lambda: cleaned.memory_usage(deep=False).sum())
 
     return cleaned, result
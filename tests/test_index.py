@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.student_data.upload import spill_upload
+
+HEADER = "student_id,week_date,grades,tardies,absences,discipline_events,truancy_days\n"
+
+
+def test_index_slices_match_store_reads():
+    # Ids and weeks out of order, spread over several chunks (store files).
+    rows = [
+        f"{sid},2025-01-{day:02d},{70 + sid}.5,{sid % 2},0,0,0\n"
+        for day in (20, 6, 13)
+        for sid in (3, 1, 2)
+    ]
+    rows.append(",2025-01-27,50.0,0,0,0,0\n")  # no student_id: not indexed
+    handle, _, _ = spill_upload(io.BytesIO((HEADER + "".join(rows)).encode()), chunk_rows=4)
+    try:
+        assert handle.student_ids().tolist() == [1, 2, 3]
+        for sid in (1, 2, 3):
+            ts = handle.timeseries(sid)
+            assert ts.equals(handle.load(student_ids=[sid]))
+            assert ts["week_date"].is_monotonic_increasing
+        with pytest.raises(KeyError):
+            handle.timeseries(99)
+    finally:
+        handle.discard()
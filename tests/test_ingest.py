@@ -0,0 +1,80 @@
+import io
+
+import pandas as pd
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.student_data.ingest import ingest_csv
+from src.student_data.store import read_student_store
+from src.student_data.validators import remove_blocked_columns
+
+HEADER = "student_id,week_date,grades,tardies,absences,discipline_events,truancy_days,notes\n"
+
+
+def _csv(rows):
+    return io.BytesIO((HEADER + "".join(rows)).encode())
+
+
+def test_column_blank_early_and_filled_late_reads_back(tmp_path):
+    # First chunk: notes and tardies blank (pandas would infer float);
+    # second chunk: text notes and whole-number tardies.
+    rows = [f"{i},2025-01-06,80.5,,0,0,0,\n" for i in range(1, 4)]
+    rows += [f"{i},2025-01-13,81.0,1,0,0,0,ok\n" for i in range(1, 4)]
+    root = str(tmp_path / "store")
+
+    result = ingest_csv(_csv(rows), root, chunk_rows=3)
+
+    assert not result.missing_required
+    # Every chunk's file has the same schema (reading back only fails when
+    # the inferred-float file happens to be opened first).
+    schemas = {str(pq.read_schema(str(f))) for f in tmp_path.glob("store/**/*.parquet")}
+    assert len(schemas) == 1
+
+    df = read_student_store(root)
+    assert len(df) == 6
+    assert df.loc[df["week_date"] == "2025-01-13", "notes"].tolist() == ["ok"] * 3
+    assert df["notes"].isna().sum() == 3
+    assert df["tardies"].isna().sum() == 3
+    assert sorted(df["student_id"].unique().tolist()) == [1, 2, 3]
+
+
+def test_pii_found_in_a_later_chunk_is_never_stored(tmp_path):
+    rows = [f"{i},2025-01-06,80.5,0,0,0,0,fine\n" for i in range(1, 4)]
+    rows += [f"{i},2025-01-13,81.0,0,0,0,0,reach me at a{i}@example.com\n" for i in range(1, 4)]
+    root = str(tmp_path / "store")
+
+    result = ingest_csv(_csv(rows), root, chunk_rows=3)
+
+    assert result.pii_value_columns == {"notes": ["email"]}
+    df = read_student_store(root)
+    assert len(df) == 6
+    assert "notes" not in df.columns
+
+
+def test_student_id_type_is_chosen_once_for_the_file(tmp_path):
+    # Whole-number ids in the first chunk, text ids in a later one.
+    rows = [f"{i},2025-01-06,80.5,0,0,0,0,\n" for i in range(1, 4)]
+    rows += ["S3,2025-01-13,81.0,0,0,0,0,\n", "4,2025-01-13,81.0,0,0,0,0,\n"]
+    root = str(tmp_path / "store")
+
+    ingest_csv(_csv(rows), root, chunk_rows=3)
+
+    schemas = {str(pq.read_schema(str(f))) for f in tmp_path.glob("store/**/*.parquet")}
+    assert len(schemas) == 1
+    df = read_student_store(root)
+    assert sorted(df["student_id"].tolist()) == ["1", "2", "3", "4", "S3"]
+
+
+def test_value_scan_skips_numeric_columns_like_remove_blocked_columns(tmp_path):
+    # 123456.7890 looks like a phone number as text, but the column is
+    # numeric over the whole file, so remove_blocked_columns never scans it.
+    rows = [f"{i},2025-01-06,80.5,0,0,0,0,fine,123456.7890\n" for i in range(1, 7)]
+    data = (HEADER.rstrip("\n") + ",reading\n" + "".join(rows)).encode()
+    _, expected = remove_blocked_columns(pd.read_csv(io.BytesIO(data)))
+
+    result = ingest_csv(io.BytesIO(data), str(tmp_path / "store"), chunk_rows=3)
+
+    assert result == expected
+    assert result.pii_value_columns == {}
+    assert "reading" in read_student_store(str(tmp_path / "store")).columns